@@ -10,27 +10,35 @@ import ctypes
 
 import os
 
+from collections import defaultdict
+
 
 
 from PyQt6.QtWidgets import (
 
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 
-    QGridLayout, QLabel, QPushButton, QScrollArea, QFrame, QGroupBox,
+    QLabel, QPushButton, QFrame, QGroupBox,
 
     QComboBox, QMessageBox, QRadioButton, QButtonGroup, QSlider,
 
-    QSizePolicy
+    QSizePolicy, QListView, QStyledItemDelegate, QStyle, QAbstractItemView
 
 )
 
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QSize, QPointF, QRectF
+from PyQt6.QtCore import (
+
+    Qt, QTimer, pyqtSignal, pyqtSlot, QThread, QSize, QPointF, QRectF, QEvent,
+
+    QAbstractListModel, QModelIndex
+
+)
 
 from PyQt6.QtGui import (
 
     QFont, QColor, QPainter, QLinearGradient, QPainterPath,
 
-    QRadialGradient, QConicalGradient, QPen, QBrush, QPolygonF
+    QRadialGradient, QConicalGradient, QPen, QBrush, QPolygonF, QPixmap
 
 )
 
@@ -50,6 +58,28 @@ except ImportError:
 
 
 
+try:
+
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+
+except ImportError:
+
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+
+        # Fallback: run the DSP kernels as plain Python
+
+        if len(args) == 1 and callable(args[0]): return args[0]
+
+        return lambda fn: fn
+
+    print("WARNING: Install numba for real-time DSP -> pip install numba")
+
+
+
 # ========================= SYSTEM OPTIMIZATIONS =========================
 
 
@@ -78,6 +108,76 @@ set_high_priority()
 
 
 
+def _avrt():
+
+    # The MMCSS handle is pointer-sized, without declared types ctypes would truncate it to a 32-bit int on 64-bit Windows
+
+    avrt = ctypes.windll.avrt
+
+    avrt.AvSetMmThreadCharacteristicsW.restype = ctypes.c_void_p
+
+    avrt.AvSetMmThreadCharacteristicsW.argtypes = [ctypes.c_wchar_p, ctypes.POINTER(ctypes.c_ulong)]
+
+    avrt.AvRevertMmThreadCharacteristics.restype = ctypes.c_int
+
+    avrt.AvRevertMmThreadCharacteristics.argtypes = [ctypes.c_void_p]
+
+    return avrt
+
+
+
+def join_pro_audio_class():
+
+    """ Register the calling thread with the Windows MMCSS "Pro Audio" task, returns the handle (or None) """
+
+    try:
+
+        if sys.platform == 'win32':
+
+            task_index = ctypes.c_ulong(0)
+
+            return _avrt().AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index)) or None
+
+    except Exception:
+
+        pass
+
+    return None
+
+
+
+def leave_pro_audio_class(handle):
+
+    try:
+
+        if handle: _avrt().AvRevertMmThreadCharacteristics(handle)
+
+    except Exception:
+
+        pass
+
+
+
+# PortAudio enumeration is slow (WASAPI can take seconds), keep the result until an explicit refresh
+
+_DEVICE_CACHE = {'devs': None, 'apis': None}
+
+
+
+def query_devices(refresh=False):
+
+    """ Cached (devices, hostapis) from sounddevice """
+
+    if refresh or _DEVICE_CACHE['devs'] is None:
+
+        _DEVICE_CACHE['devs'] = sd.query_devices()
+
+        _DEVICE_CACHE['apis'] = sd.query_hostapis()
+
+    return _DEVICE_CACHE['devs'], _DEVICE_CACHE['apis']
+
+
+
 # ========================= PRESETS LIBRARY =========================
 
 PRESETS = {
@@ -328,185 +428,391 @@ PRESETS = {
 
 }
 
+
+
+# Struct-of-arrays view of PRESETS: one float32 row per preset, in menu order
+
+PRESET_KEYS = ("bass", "treble", "loudness", "spatial", "pan_depth", "pan_speed",
+
+               "phase_offset", "delay_ms", "head_shadow", "distance")
+
+P_BASS, P_TREBLE, P_LOUD, P_SPATIAL, P_PAN_DEPTH, P_PAN_SPEED = range(6)
+
+_PRESET_DEFAULTS = {"bass": 1.0, "treble": 1.0, "loudness": 1.0}
+
+FLAT_PARAMS = np.array([_PRESET_DEFAULTS.get(k, 0.0) for k in PRESET_KEYS], dtype=np.float32)
+
+PRESET_PARAMS = np.array([[p.get(k, _PRESET_DEFAULTS.get(k, 0.0)) for k in PRESET_KEYS]
+
+                          for presets in PRESETS.values() for p in presets.values()], dtype=np.float32)
+
+
+
+def _parse_presets():
+
+    """ Button labels split once at import: ((category, ((row, emoji, short_name), ...)), ...) """
+
+    parsed, row = [], 0
+
+    for category, presets in PRESETS.items():
+
+        entries = []
+
+        for name in presets:
+
+            emoji, short_name = name.split(" ", 1) if " " in name else (name, name)
+
+            entries.append((row, emoji, short_name))
+
+            row += 1
+
+        parsed.append((category, tuple(entries)))
+
+    return tuple(parsed)
+
+
+
+_PRESETS_PARSED = _parse_presets()
+
+
+
 # ========================= AUDIO ENGINE =========================
 
 
 
-class AudioProcessor:
+BASS_SHELF_HZ = 250.0
 
-    def __init__(self, sample_rate, block_size):
+TREBLE_SHELF_HZ = 4000.0
 
-        self.sample_rate = sample_rate
+EQ_NONE, EQ_BASS, EQ_TREBLE, EQ_BOTH = 0, 1, 2, 3 # shelf stages the kernel runs
 
-        self.block_size = block_size
+LFO_LUT_BITS = 12 # 4096-entry sine table, indexed by the top bits of a 32-bit phase
 
-        self.preset = {"bass": 1.0, "treble": 1.0, "loudness": 1.0, "spatial": 0.0}
 
-        self.master_volume = 1.0
 
-       
+def shelf_coeffs(gain, freq, sample_rate, high=False, q=0.707):
 
-        # 8D State
+    """ RBJ shelving biquad (same formulation as torchaudio bass/treble_biquad), a0 normalised to 1 """
 
-        self.phase = 0.0
+    A = math.sqrt(max(gain, 1e-3)) # linear gain -> 10^(dB/40)
 
-        self.input_level = 0.0
+    w0 = 2.0 * math.pi * freq / sample_rate
 
-        self.output_level = 0.0
+    alpha = math.sin(w0) / (2.0 * q)
 
-       
+    t1 = 2.0 * math.sqrt(A) * alpha
 
-        # FFT Setup
+    t2 = (A - 1.0) * math.cos(w0)
 
-        self.freqs = np.fft.rfftfreq(block_size, 1.0 / sample_rate)
+    t3 = (A + 1.0) * math.cos(w0)
 
-        self.bass_indices = np.where(self.freqs < 250)[0]
+    if high:
 
-        self.treble_indices = np.where(self.freqs > 4000)[0]
+        b = (A * ((A + 1.0) + t2 + t1), -2.0 * A * ((A - 1.0) + t3), A * ((A + 1.0) + t2 - t1))
 
+        a = ((A + 1.0) - t2 + t1, 2.0 * ((A - 1.0) - t3), (A + 1.0) - t2 - t1)
 
+    else:
 
-    def set_preset(self, params):
+        b = (A * ((A + 1.0) - t2 + t1), 2.0 * A * ((A - 1.0) - t3), A * ((A + 1.0) - t2 - t1))
 
-        self.preset = params.copy()
+        a = ((A + 1.0) + t2 + t1, -2.0 * ((A - 1.0) + t3), (A + 1.0) + t2 - t1)
 
+    return np.array(b, dtype=np.float32) / np.float32(a[0]), np.array(a, dtype=np.float32) / np.float32(a[0])
 
 
-    def set_volume(self, volume):
 
-        self.master_volume = max(0.0, min(2.0, volume))
+@njit(cache=True, fastmath=True, inline="always")
 
+def _soft_clip(x):
 
+    """ Pade approximation of tanh, x * (27 + x^2) / (27 + 9x^2), reaching exactly +-1 at |x| = 3 """
 
-    def process(self, indata):
+    x = min(max(x, -3.0), 3.0)
 
-        try:
+    x2 = x * x
 
-            if indata is None: return np.zeros((self.block_size, 2), dtype=np.float32)
+    return x * (27.0 + x2) / (27.0 + 9.0 * x2)
 
-           
 
-            # Stereo handling
 
-            if indata.ndim == 1: audio = np.column_stack((indata, indata))
+# C-contiguous (N, 2) blocks: L/R interleaved, unit-stride loads and stores in the fused loop
 
-            elif indata.shape[1] == 1: audio = np.column_stack((indata[:, 0], indata[:, 0]))
+_DSP_KERNEL_SIG = ("void(float32[:, ::1], float32[:, ::1], float32[::1], float32[:, ::1], float32[::1], float32[::1], "
 
-            else: audio = indata
+                   "float32[::1], float32[::1], int64, int64, int64, float64, int16[:, ::1], float32[::1])")
 
 
 
-            # Input Meter
+@njit(_DSP_KERNEL_SIG, cache=True, fastmath=True, boundscheck=False, nogil=True)
 
-            self.input_level = np.max(np.abs(audio[:100])) * 2.0
+def _dsp_kernel(audio, out, params, eq_state, bass_b, bass_a, treble_b, treble_a, eq_mode,
 
-           
+                phase, phase_inc, master, pan_lut, levels):
 
-            # Params
+    """ Whole per-block chain in one pass: shelf EQ -> 8D pan -> M/S width -> loudness * master -> soft clip.
 
-            bass = self.preset.get("bass", 1.0)
+        Block peaks of input and output are written to levels[0] / levels[1]. """
 
-            treble = self.preset.get("treble", 1.0)
+    # Pan and M/S are linear, so loudness folds into the master gain
 
-            loud = self.preset.get("loudness", 1.0)
+    gain = params[P_LOUD] * master
 
-            spatial = self.preset.get("spatial", 0.0)
+    spatial = params[P_SPATIAL]
 
-            pan_depth = self.preset.get("pan_depth", 0.0)
+    pan_depth = params[P_PAN_DEPTH]
 
-            pan_speed = self.preset.get("pan_speed", 0.0)
+    # Biquad state (TDF-II) lives in locals for the duration of the block
 
-           
+    bl1 = eq_state[0, 0]; bl2 = eq_state[0, 1]; br1 = eq_state[1, 0]; br2 = eq_state[1, 1]
 
-            # FFT EQ
+    tl1 = eq_state[2, 0]; tl2 = eq_state[2, 1]; tr1 = eq_state[3, 0]; tr2 = eq_state[3, 1]
 
-            if abs(bass - 1.0) > 0.01 or abs(treble - 1.0) > 0.01:
+    pan_on = pan_depth > 0.01
 
-                l_fft = np.fft.rfft(audio[:, 0])
+    width_on = abs(spatial) > 0.01
 
-                if bass != 1.0: l_fft[self.bass_indices] *= bass
+    side_gain = 0.5 * (1.0 + spatial)
 
-                if treble != 1.0: l_fft[self.treble_indices] *= treble
+    in_peak = 0.0
 
-                l_out = np.fft.irfft(l_fft, n=self.block_size)
+    out_peak = 0.0
 
-               
+    for i in range(audio.shape[0]):
 
-                r_fft = np.fft.rfft(audio[:, 1])
+        l = audio[i, 0]
 
-                if bass != 1.0: r_fft[self.bass_indices] *= bass
+        r = audio[i, 1]
 
-                if treble != 1.0: r_fft[self.treble_indices] *= treble
+        in_peak = max(in_peak, abs(l), abs(r))
 
-                r_out = np.fft.irfft(r_fft, n=self.block_size)
+        if eq_mode & EQ_BASS:
 
-               
+            y = bass_b[0] * l + bl1
 
-                out = np.column_stack((l_out, r_out))
+            bl1 = bass_b[1] * l - bass_a[1] * y + bl2
 
-            else:
+            bl2 = bass_b[2] * l - bass_a[2] * y
 
-                out = audio.copy()
+            l = y
 
+            y = bass_b[0] * r + br1
 
+            br1 = bass_b[1] * r - bass_a[1] * y + br2
 
-            out *= loud
+            br2 = bass_b[2] * r - bass_a[2] * y
 
+            r = y
 
+        if eq_mode & EQ_TREBLE:
 
-            # 8D Logic
+            y = treble_b[0] * l + tl1
 
-            if pan_depth > 0.01:
+            tl1 = treble_b[1] * l - treble_a[1] * y + tl2
 
-                n_samples = len(out)
+            tl2 = treble_b[2] * l - treble_a[2] * y
 
-                t = np.arange(n_samples) / self.sample_rate
+            l = y
 
-                lfo_phase = self.phase + 2 * np.pi * pan_speed * t
+            y = treble_b[0] * r + tr1
 
-                self.phase = lfo_phase[-1] % (2 * np.pi)
+            tr1 = treble_b[1] * r - treble_a[1] * y + tr2
 
-                pan = np.sin(lfo_phase) * pan_depth
+            tr2 = treble_b[2] * r - treble_a[2] * y
 
-                theta = (pan + 1.0) * (np.pi / 4.0)
+            r = y
 
-                out[:, 0] *= np.cos(theta)
+        if pan_on:
 
-                out[:, 1] *= np.sin(theta)
+            # Q15 constant-power pan gains, looked up by LFO phase
 
+            k = ((phase + phase_inc * i) & 0xFFFFFFFF) >> (32 - LFO_LUT_BITS)
 
+            l *= pan_lut[0, k] * (1.0 / 32768.0)
 
-            # Spatial
+            r *= pan_lut[1, k] * (1.0 / 32768.0)
 
-            if abs(spatial) > 0.01:
+        if width_on:
 
-                mid = (out[:, 0] + out[:, 1]) * 0.5
+            # M/S on the interleaved pair, stays in registers
 
-                side = (out[:, 0] - out[:, 1]) * 0.5
+            mid = (l + r) * 0.5
 
-                side *= (1.0 + spatial)
+            side = (l - r) * side_gain
 
-                out[:, 0] = mid + side
+            l = mid + side
 
-                out[:, 1] = mid - side
+            r = mid - side
 
+        l = _soft_clip(l * gain)
 
+        r = _soft_clip(r * gain)
 
-            out *= self.master_volume
+        out[i, 0] = l
 
-            np.tanh(out, out=out) # Soft clip
+        out[i, 1] = r
 
-           
+        out_peak = max(out_peak, abs(l), abs(r))
+
+    levels[0] = in_peak
+
+    levels[1] = out_peak
+
+    eq_state[0, 0] = bl1; eq_state[0, 1] = bl2; eq_state[1, 0] = br1; eq_state[1, 1] = br2
+
+    eq_state[2, 0] = tl1; eq_state[2, 1] = tl2; eq_state[3, 0] = tr1; eq_state[3, 1] = tr2
+
+
+
+class AudioProcessor:
+
+    def __init__(self, sample_rate, block_size):
+
+        self.sample_rate = sample_rate
+
+        self._params = FLAT_PARAMS.copy()
+
+        self.master_volume = 1.0
+
+       
+
+        # 8D State
+
+        self._sin_lut = np.sin(np.linspace(0, 2 * np.pi, 1 << LFO_LUT_BITS, endpoint=False)).astype(np.float32)
+
+        self._phase_int = 0
+
+        self._pan_lut = np.zeros((2, 1 << LFO_LUT_BITS), dtype=np.int16) # L/R gains, Q15
+
+        self._pan_depth = None
+
+        # Meter cells (in, out): the kernel stores block peaks straight into them and the UI
+
+        # thread reads them back, aligned 4-byte floats so no lock or attribute writes are involved
+
+        self.levels = (ctypes.c_float * 2)()
+
+        self._levels = np.frombuffer(self.levels, dtype=np.float32)
+
+       
+
+        # Shelf EQ (biquad state per filter/channel: bass L, bass R, treble L, treble R)
+
+        self._eq_state = np.zeros((4, 2), dtype=np.float32)
+
+        self._eq_gains = None
+
+        self._update_params()
+
+        self.set_block_size(block_size)
+
+
+
+    def set_block_size(self, block_size):
+
+        self.block_size = block_size
+
+        self._work = np.zeros((block_size, 2), dtype=np.float32)
+
+        self._out = np.zeros((block_size, 2), dtype=np.float32)
+
+
+
+    def set_preset(self, idx):
+
+        self._params[:] = PRESET_PARAMS[idx]
+
+        self._update_params()
+
+
+
+    def _update_params(self):
+
+        # 8D LFO advances as a 32-bit integer phase (wraps for free)
+
+        self._phase_inc = int(float(self._params[P_PAN_SPEED]) * (1 << 32) / self.sample_rate) & 0xFFFFFFFF
+
+        depth = float(self._params[P_PAN_DEPTH])
+
+        if depth != self._pan_depth:
+
+            # Constant-power pan: gL = sqrt((1 - pan) / 2), gR = sqrt((1 + pan) / 2), stored as Q15
+
+            self._pan_depth = depth
+
+            pan = self._sin_lut * (0.5 * depth)
+
+            self._pan_lut[0] = np.rint(np.sqrt(0.5 - pan) * 32767.0)
+
+            self._pan_lut[1] = np.rint(np.sqrt(0.5 + pan) * 32767.0)
+
+        # Coefficients only change with the bass / treble gains
+
+        gains = (float(self._params[P_BASS]), float(self._params[P_TREBLE]))
+
+        if gains == self._eq_gains: return
+
+        # Flat shelves are skipped entirely, a single active one runs alone
+
+        self._eq_mode = (EQ_BASS if abs(gains[0] - 1.0) > 0.01 else EQ_NONE) | (EQ_TREBLE if abs(gains[1] - 1.0) > 0.01 else EQ_NONE)
+
+        self._eq_gains = gains
+
+        self._bass_b, self._bass_a = shelf_coeffs(gains[0], BASS_SHELF_HZ, self.sample_rate)
+
+        self._treble_b, self._treble_a = shelf_coeffs(gains[1], TREBLE_SHELF_HZ, self.sample_rate, high=True)
+
+
+
+    def set_volume(self, volume):
 
-            self.output_level = np.max(np.abs(out[:100])) * 2.0
+        self.master_volume = max(0.0, min(2.0, volume))
+
+
+
+    def process(self, indata):
+
+        if indata is None: return np.zeros((self.block_size, 2), dtype=np.float32)
+
+        # Everything downstream (buffers, LUT, params, EQ state) is float32
+
+        if indata.dtype != np.float32: indata = indata.astype(np.float32)
+
+       
+
+        n = len(indata)
+
+        if n > len(self._out): self.set_block_size(n)
+
+        out = self._out[:n]
+
+
+
+        # Stereo handling (mono is duplicated into the preallocated work buffer)
 
-            return out.astype(np.float32)
+        if indata.ndim == 1:
 
+            audio = self._work[:n]
 
+            audio[:, 0] = indata; audio[:, 1] = indata
 
-        except Exception:
+        elif indata.shape[1] == 1:
 
-            return indata
+            audio = self._work[:n]
+
+            audio[:, 0] = indata[:, 0]; audio[:, 1] = indata[:, 0]
+
+        else: audio = indata
+
+
+
+        _dsp_kernel(audio, out, self._params, self._eq_state, self._bass_b, self._bass_a, self._treble_b, self._treble_a,
+
+                    self._eq_mode, self._phase_int, self._phase_inc, self.master_volume, self._pan_lut, self._levels)
+
+        self._phase_int = (self._phase_int + self._phase_inc * n) & 0xFFFFFFFF
+
+        return out
 
 
 
@@ -516,13 +822,21 @@ class AudioThread(QThread):
 
     error_signal = pyqtSignal(str)
 
+    processor_ready = pyqtSignal(object)
 
+    levels_signal = pyqtSignal(float, float) # (in, out) block peaks, pushed once per block
 
-    def __init__(self, processor, input_idx, output_idx, sample_rate, buffer_mode):
+
+
+    def __init__(self, input_idx, output_idx, sample_rate, buffer_mode, volume=1.0, preset=-1):
 
         super().__init__()
 
-        self.processor = processor
+        self.processor = None
+
+        self.volume = volume
+
+        self.preset = preset
 
         self.input_idx = input_idx
 
@@ -546,71 +860,69 @@ class AudioThread(QThread):
 
        
 
-        self.processor.block_size = bs
-
-        # Re-init FFT bins for new blocksize
+        silence = np.zeros((bs, 2), dtype=np.float32)
 
-        self.processor.freqs = np.fft.rfftfreq(bs, 1.0 / self.sample_rate)
-
-        self.processor.bass_indices = np.where(self.processor.freqs < 250)[0]
-
-        self.processor.treble_indices = np.where(self.processor.freqs > 4000)[0]
+        mmcss = join_pro_audio_class()
 
 
 
         try:
 
-            with sd.Stream(
+            # Processor (buffers, LUTs, kernel warm-up) is built here, off the UI thread
 
-                device=(self.input_idx, self.output_idx),
+            self.processor = AudioProcessor(self.sample_rate, bs)
 
-                samplerate=self.sample_rate,
+            self.processor.set_volume(self.volume)
 
-                blocksize=bs,
+            if self.preset >= 0: self.processor.set_preset(self.preset)
 
-                dtype=np.float32,
+            self.processor_ready.emit(self.processor)
 
-                channels=2,
+            # Warm the kernel and the block buffers before the first real block
 
-                latency=lat,
+            self.processor.process(silence)
 
-                callback=self.audio_callback
+            # Blocking read/write: PortAudio blocks in C, no Python callback on its real-time thread
 
-            ):
+            with sd.InputStream(device=self.input_idx, samplerate=self.sample_rate, blocksize=bs,
 
-                self.status_signal.emit(f"ONLINE | {self.sample_rate}Hz")
+                                dtype=np.float32, channels=2, latency=lat) as istream:
 
-                while self.running:
+                with sd.OutputStream(device=self.output_idx, samplerate=self.sample_rate, blocksize=bs,
 
-                    self.msleep(100)
+                                     dtype=np.float32, channels=2, latency=lat) as ostream:
 
-        except Exception as e:
+                    self.status_signal.emit(f"ONLINE | {self.sample_rate}Hz")
 
-            self.error_signal.emit(str(e))
+                    while self.running:
 
-       
+                        indata, overflowed = istream.read(bs)
 
-        self.status_signal.emit("OFFLINE")
+                        if overflowed: ostream.write(silence); continue
 
+                        try:
 
+                            outdata = self.processor.process(indata)
 
-    def audio_callback(self, indata, outdata, frames, time, status):
+                        except Exception:
 
-        if status: outdata.fill(0); return
+                            outdata = silence
 
-        try:
+                        ostream.write(outdata)
 
-            result = self.processor.process(indata)
+                        self.levels_signal.emit(*self.processor.levels)
 
-            n = min(len(result), len(outdata))
+        except Exception as e:
 
-            outdata[:n] = result[:n]
+            self.error_signal.emit(str(e))
+
+       
 
-            if n < len(outdata): outdata[n:] = 0
+        leave_pro_audio_class(mmcss)
 
-        except:
+        self.levels_signal.emit(0.0, 0.0)
 
-            outdata.fill(0)
+        self.status_signal.emit("OFFLINE")
 
 
 
@@ -628,6 +940,24 @@ class AudioThread(QThread):
 
 class SciFiReactor(QWidget):
 
+    # Paint colours are parsed once here instead of from hex strings every frame
+
+    COLOR_OUTER = QColor("#00ffcc")
+
+    COLOR_INNER = QColor("#ff00cc")
+
+    CORE_HOT = (QColor("#ffaa00"), QColor("#550000")) # Warning orange/red
+
+    CORE_COOL = (QColor("#ffffff"), QColor("#00ccff"), QColor("#002233"))
+
+    COLOR_TRIANGLE = QColor(255, 255, 255, 100)
+
+    # Unit triangle, scaled to the core radius at paint time
+
+    TRIANGLE = QPolygonF([QPointF(0, -0.6), QPointF(0.5, 0.3), QPointF(-0.5, 0.3)])
+
+
+
     def __init__(self):
 
         super().__init__()
@@ -638,12 +968,20 @@ class SciFiReactor(QWidget):
 
         self.audio_level = 0.0
 
+        self._target_level = 0.0
+
         self.angle_1 = 0
 
         self.angle_2 = 180
 
         self.angle_3 = 90
 
+        self._last_level = 0.0
+
+        self._tick = 0
+
+        self._glow_pixmap = None
+
        
 
         # Animation loop
@@ -652,15 +990,21 @@ class SciFiReactor(QWidget):
 
         self.timer.timeout.connect(self.animate)
 
-        self.timer.start(16) # ~60 FPS
+        self.timer.start(33) # ~30 FPS
 
 
 
     def set_level(self, level):
 
+        self._target_level = level
+
+
+
+    def animate(self):
+
         # Smooth attack, fast decay
 
-        target = level
+        target = self._target_level
 
         if target > self.audio_level:
 
@@ -670,9 +1014,7 @@ class SciFiReactor(QWidget):
 
             self.audio_level = self.audio_level * 0.9 + target * 0.1
 
-
-
-    def animate(self):
+       
 
         # Rotation speed based on audio intensity
 
@@ -684,17 +1026,21 @@ class SciFiReactor(QWidget):
 
         self.angle_3 = (self.angle_3 + (speed * 0.3)) % 360
 
-        self.update()
+        # Idle: only repaint every 4th tick
 
+        self._tick = (self._tick + 1) % 4
 
+        if abs(self.audio_level - self._last_level) > 0.005 or speed > 2.5 or self._tick == 0:
 
-    def paintEvent(self, e):
+            self._last_level = self.audio_level
 
-        p = QPainter(self)
+            self.update()
 
-        p.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-       
+
+    def resizeEvent(self, e):
+
+        # Background glow only depends on the widget size, render it once here
 
         w, h = self.width(), self.height()
 
@@ -702,15 +1048,13 @@ class SciFiReactor(QWidget):
 
         base_size = min(w, h) * 0.35
 
-       
-
-        # Audio reactive pulse size
+        dpr = self.devicePixelRatioF()
 
-        pulse = base_size * (1 + (self.audio_level * 0.5))
+        self._glow_pixmap = QPixmap(int(w * dpr), int(h * dpr))
 
-       
+        self._glow_pixmap.setDevicePixelRatio(dpr)
 
-        # 1. Background Glow
+        self._glow_pixmap.fill(Qt.GlobalColor.transparent)
 
         grad = QRadialGradient(center, base_size * 2)
 
@@ -718,19 +1062,53 @@ class SciFiReactor(QWidget):
 
         grad.setColorAt(1, QColor(0, 0, 0, 0))
 
-        p.fillRect(self.rect(), Qt.BrushStyle.NoBrush) # Clear
+        gp = QPainter(self._glow_pixmap)
 
-        p.setBrush(grad)
+        gp.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        p.setPen(Qt.PenStyle.NoPen)
+        gp.setBrush(grad)
+
+        gp.setPen(Qt.PenStyle.NoPen)
+
+        gp.drawEllipse(center, base_size*2, base_size*2)
+
+        gp.end()
 
-        p.drawEllipse(center, base_size*2, base_size*2)
+        super().resizeEvent(e)
+
+
+
+    def paintEvent(self, e):
+
+        p = QPainter(self)
+
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+       
+
+        w, h = self.width(), self.height()
+
+        center = QPointF(w/2, h/2)
+
+        base_size = min(w, h) * 0.35
+
+       
+
+        # Audio reactive pulse size
+
+        pulse = base_size * (1 + (self.audio_level * 0.5))
+
+       
+
+        # 1. Background Glow (cached per size)
+
+        if self._glow_pixmap is not None: p.drawPixmap(0, 0, self._glow_pixmap)
 
 
 
         # 2. Outer Rotating Ring (Tech HUD style)
 
-        pen = QPen(QColor("#00ffcc"))
+        pen = QPen(self.COLOR_OUTER)
 
         pen.setWidth(3)
 
@@ -750,7 +1128,7 @@ class SciFiReactor(QWidget):
 
         # 3. Inner Rotating Ring
 
-        pen.setColor(QColor("#ff00cc"))
+        pen.setColor(self.COLOR_INNER)
 
         pen.setWidth(2)
 
@@ -774,17 +1152,17 @@ class SciFiReactor(QWidget):
 
         if self.audio_level > 0.5:
 
-            core_grad.setColorAt(0, QColor("#ffaa00")) # Warning orange/red
+            core_grad.setColorAt(0, self.CORE_HOT[0])
 
-            core_grad.setColorAt(1, QColor("#550000"))
+            core_grad.setColorAt(1, self.CORE_HOT[1])
 
         else:
 
-            core_grad.setColorAt(0, QColor("#ffffff"))
+            core_grad.setColorAt(0, self.CORE_COOL[0])
 
-            core_grad.setColorAt(0.3, QColor("#00ccff"))
+            core_grad.setColorAt(0.3, self.CORE_COOL[1])
 
-            core_grad.setColorAt(1, QColor("#002233"))
+            core_grad.setColorAt(1, self.CORE_COOL[2])
 
            
 
@@ -804,11 +1182,11 @@ class SciFiReactor(QWidget):
 
         p.rotate(self.angle_3)
 
-        poly = QPolygonF([QPointF(0, -core_rad*0.6), QPointF(core_rad*0.5, core_rad*0.3), QPointF(-core_rad*0.5, core_rad*0.3)])
+        p.scale(core_rad, core_rad)
 
-        p.setBrush(QColor(255, 255, 255, 100))
+        p.setBrush(self.COLOR_TRIANGLE)
 
-        p.drawPolygon(poly)
+        p.drawPolygon(self.TRIANGLE)
 
         p.restore()
 
@@ -838,41 +1216,141 @@ class ModernButton(QPushButton):
 
     def set_style(self):
 
-        if self.is_primary:
+        # Looks live in APP_STYLE, keyed by object name
+
+        self.setObjectName("primaryButton" if self.is_primary else "modernButton")
+
+
+
+class PresetModel(QAbstractListModel):
+
+    """ Flat list of category headers followed by their presets, built from _PRESETS_PARSED """
+
+    ROW_ROLE = Qt.ItemDataRole.UserRole # PRESET_PARAMS row, -1 for headers
+
+
+
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+
+        self._rows = []
+
+        for category, entries in _PRESETS_PARSED:
+
+            self._rows.append((category, -1))
+
+            for idx, emoji, short_name in entries:
+
+                self._rows.append((f"{emoji} {short_name}", idx))
 
-            self.setStyleSheet("""
 
-                QPushButton {
 
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #009977, stop:1 #00cc88);
+    def rowCount(self, parent=QModelIndex()):
 
-                    color: white; border: none; border-radius: 5px; font-weight: bold; font-size: 13px;
+        return 0 if parent.isValid() else len(self._rows)
 
-                }
 
-                QPushButton:hover { background: #00ffaa; }
 
-                QPushButton:pressed { background: #007755; }
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
 
-            """)
+        if not index.isValid(): return None
+
+        label, idx = self._rows[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole: return label
+
+        if role == self.ROW_ROLE: return idx
+
+        return None
+
+
+
+    def flags(self, index):
+
+        # Headers show but can't be selected
+
+        if not index.isValid() or self._rows[index.row()][1] < 0: return Qt.ItemFlag.ItemIsEnabled
+
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+
+class PresetDelegate(QStyledItemDelegate):
+
+    """ Paints presets as rounded buttons, only for the rows in view """
+
+    COLOR_HEADER = QColor("#00ffcc")
+
+    # (fill, border, text) per state
+
+    LOOK_NORMAL = (QColor("#2a2a3a"), QColor("#444444"), QColor("#cccccc"))
+
+    LOOK_HOVER = (QColor("#333333"), QColor("#00ffcc"), QColor("#ffffff"))
+
+    LOOK_CHECKED = (QColor("#00ffcc"), None, QColor("#000000"))
+
+
+
+    def sizeHint(self, option, index):
+
+        return QSize(0, 34 if index.data(PresetModel.ROW_ROLE) < 0 else 40)
+
+
+
+    def paint(self, p, option, index):
+
+        label = index.data(Qt.ItemDataRole.DisplayRole)
+
+        rect = QRectF(option.rect).adjusted(2, 3, -2, -3)
+
+        font = QFont(option.font)
+
+        p.save()
+
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if index.data(PresetModel.ROW_ROLE) < 0:
+
+            font.setBold(True)
+
+            p.setFont(font)
+
+            p.setPen(self.COLOR_HEADER)
+
+            p.drawText(rect.adjusted(8, 8, 0, 0), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, label)
 
         else:
 
-            self.setStyleSheet("""
+            if option.state & QStyle.StateFlag.State_Selected:
+
+                fill, border, text = self.LOOK_CHECKED
+
+                font.setBold(True)
+
+            elif option.state & QStyle.StateFlag.State_MouseOver:
+
+                fill, border, text = self.LOOK_HOVER
+
+            else:
+
+                fill, border, text = self.LOOK_NORMAL
+
+            p.setPen(QPen(border) if border is not None else Qt.PenStyle.NoPen)
 
-                QPushButton {
+            p.setBrush(fill)
 
-                    background: #2a2a3a; color: #ccc; border: 1px solid #444;
+            p.drawRoundedRect(rect, 5, 5)
 
-                    border-radius: 5px; font-size: 12px;
+            p.setFont(font)
 
-                }
+            p.setPen(text)
 
-                QPushButton:hover { border: 1px solid #00ffcc; color: white; background: #333; }
+            p.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+
+        p.restore()
 
-                QPushButton:checked { background: #00ffcc; color: black; border: none; font-weight: bold;}
 
-            """)
 
 
 
@@ -880,47 +1358,121 @@ class ModernButton(QPushButton):
 
 
 
+# Whole-app stylesheet, parsed once by QApplication instead of per widget
+
+APP_STYLE = """
+
+    QMainWindow { background-color: #0b0f19; }
+
+    QLabel { color: #8899aa; font-family: 'Segoe UI'; }
+
+    QComboBox {
+
+        background: #1a1f2e; color: #00ffcc; border: 1px solid #334455;
+
+        padding: 5px; border-radius: 4px;
+
+    }
+
+    QGroupBox {
+
+        border: 1px solid #334455; border-radius: 8px; margin-top: 20px;
+
+        font-weight: bold; color: #00ffcc;
+
+    }
+
+    QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }
+
+    QSlider::groove:horizontal { height: 6px; background: #222; border-radius: 3px; }
+
+    QSlider::handle:horizontal { width: 16px; margin: -5px 0; border-radius: 8px; background: #00ffcc; }
+
+    QSlider::sub-page:horizontal { background: #008866; border-radius: 3px; }
+
+    QRadioButton { color: white; }
+
+
+
+    QFrame#sidePanel, QFrame#sidePanel * { background: #111625; border-radius: 15px; border: 1px solid #223344; }
+
+    QFrame#centerPanel, QFrame#centerPanel * { background: transparent; }
+
+    QListView#presetList, QListView#presetList * { background: transparent; border: none; }
+
+    QLabel#title { font-size: 26px; font-weight: 900; color: white; letter-spacing: 2px; }
+
+    QLabel#subtitle { font-size: 10px; color: #00ffcc; letter-spacing: 4px; margin-bottom: 20px; }
+
+
+
+    QPushButton#primaryButton {
+
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #009977, stop:1 #00cc88);
+
+        color: white; border: none; border-radius: 5px; font-weight: bold; font-size: 13px;
+
+    }
+
+    QPushButton#primaryButton:hover { background: #00ffaa; }
+
+    QPushButton#primaryButton:pressed { background: #007755; }
+
+    QPushButton#modernButton {
+
+        background: #2a2a3a; color: #ccc; border: 1px solid #444;
+
+        border-radius: 5px; font-size: 12px;
+
+    }
+
+    QPushButton#modernButton:hover { border: 1px solid #00ffcc; color: white; background: #333; }
+
+    QPushButton#modernButton:checked { background: #00ffcc; color: black; border: none; font-weight: bold;}
+
+"""
+
+
+
 class MainWindow(QMainWindow):
 
-    def __init__(self):
+    # Power button / status label looks, shared by every toggle
 
-        super().__init__()
+    _BTN_OFF_STYLE = """
 
-        self.setWindowTitle("⚡ NEURO-AUDIO CORE")
+        QPushButton {
 
-        self.resize(1100, 700)
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #009977, stop:1 #00cc88);
 
-        self.setStyleSheet("""
+            color: white; border: none; border-radius: 5px; font-weight: bold; font-size: 16px;
 
-            QMainWindow { background-color: #0b0f19; }
+        }
 
-            QLabel { color: #8899aa; font-family: 'Segoe UI'; }
+        QPushButton:hover { background: #00ffaa; }
 
-            QComboBox {
+    """
 
-                background: #1a1f2e; color: #00ffcc; border: 1px solid #334455;
+    _BTN_ON_STYLE = """
 
-                padding: 5px; border-radius: 4px;
+        QPushButton { background: #550000; color: white; border: 1px solid #ff0000; border-radius: 5px; font-weight: bold; font-size: 16px; }
 
-            }
+        QPushButton:hover { background: #770000; }
 
-            QGroupBox {
+    """
 
-                border: 1px solid #334455; border-radius: 8px; margin-top: 20px;
+    _STATUS_OFF_STYLE = "background: #220000; color: #ff5555; padding: 8px; border-radius: 4px; font-weight: bold;"
 
-                font-weight: bold; color: #00ffcc;
+    _STATUS_ON_STYLE = "background: #002211; color: #00ff88; padding: 8px; border-radius: 4px; font-weight: bold;"
 
-            }
 
-            QGroupBox::title { subcontrol-origin: margin; left: 10px; padding: 0 5px; }
 
-            QSlider::groove:horizontal { height: 6px; background: #222; border-radius: 3px; }
+    def __init__(self):
 
-            QSlider::handle:horizontal { width: 16px; margin: -5px 0; border-radius: 8px; background: #00ffcc; }
+        super().__init__()
 
-            QSlider::sub-page:horizontal { background: #008866; border-radius: 3px; }
+        self.setWindowTitle("⚡ NEURO-AUDIO CORE")
 
-        """)
+        self.resize(1100, 700)
 
        
 
@@ -930,23 +1482,21 @@ class MainWindow(QMainWindow):
 
         self.device_pairs = []
 
-        self.active_preset_btn = None
+        self._preset_idx = -1 # Last preset applied, headers can clear the view's selection without changing it
 
-       
+        # Last displayed meter values (0.1% steps, visualizer in 1/64 steps)
 
-        self.init_ui()
+        self._last_in_pct = -1
 
-        self.scan_devices()
+        self._last_out_pct = -1
 
-       
-
-        # Audio Link Timer
+        self._last_viz = -1
 
-        self.sync_timer = QTimer()
+       
 
-        self.sync_timer.timeout.connect(self.sync_ui)
+        self.init_ui()
 
-        self.sync_timer.start(30) # 30ms updates
+        self.scan_devices()
 
 
 
@@ -974,21 +1524,25 @@ class MainWindow(QMainWindow):
 
         left_panel.setFixedWidth(320)
 
-        left_panel.setStyleSheet("background: #111625; border-radius: 15px; border: 1px solid #223344;")
+        left_panel.setObjectName("sidePanel")
 
         left_layout = QVBoxLayout(left_panel)
 
+        left_layout.setContentsMargins(12, 12, 12, 12)
+
+        left_layout.setSpacing(6)
+
        
 
         # Title
 
         title = QLabel("NEURO CORE")
 
-        title.setStyleSheet("font-size: 26px; font-weight: 900; color: white; letter-spacing: 2px;")
+        title.setObjectName("title")
 
         subtitle = QLabel("HOLOGRAPHIC AUDIO ENGINE")
 
-        subtitle.setStyleSheet("font-size: 10px; color: #00ffcc; letter-spacing: 4px; margin-bottom: 20px;")
+        subtitle.setObjectName("subtitle")
 
         left_layout.addWidget(title)
 
@@ -1000,7 +1554,7 @@ class MainWindow(QMainWindow):
 
         self.lbl_status = QLabel("SYSTEM OFFLINE")
 
-        self.lbl_status.setStyleSheet("background: #220000; color: #ff5555; padding: 8px; border-radius: 4px; font-weight: bold; text-align: center;")
+        self.lbl_status.setStyleSheet(self._STATUS_OFF_STYLE)
 
         self.lbl_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -1020,7 +1574,7 @@ class MainWindow(QMainWindow):
 
         btn_refresh = ModernButton("Scan Devices")
 
-        btn_refresh.clicked.connect(self.scan_devices)
+        btn_refresh.clicked.connect(self.refresh_devices)
 
         left_layout.addWidget(btn_refresh)
 
@@ -1032,16 +1586,16 @@ class MainWindow(QMainWindow):
 
         v_mode = QVBoxLayout(g_mode)
 
+        v_mode.setContentsMargins(8, 8, 8, 8)
+
+        v_mode.setSpacing(4)
+
         self.btn_stable = QRadioButton("STABLE (Fix Glitches)")
 
         self.btn_fast = QRadioButton("FAST (Low Latency)")
 
         self.btn_stable.setChecked(True)
 
-        self.btn_stable.setStyleSheet("color: white;")
-
-        self.btn_fast.setStyleSheet("color: white;")
-
         v_mode.addWidget(self.btn_stable)
 
         v_mode.addWidget(self.btn_fast)
@@ -1078,7 +1632,7 @@ class MainWindow(QMainWindow):
 
         self.btn_power.setFixedHeight(60)
 
-        self.btn_power.setStyleSheet(self.btn_power.styleSheet() + "font-size: 16px;")
+        self.btn_power.setStyleSheet(self._BTN_OFF_STYLE)
 
         self.btn_power.clicked.connect(self.toggle_power)
 
@@ -1094,10 +1648,14 @@ class MainWindow(QMainWindow):
 
         center_panel = QFrame()
 
-        center_panel.setStyleSheet("background: transparent;")
+        center_panel.setObjectName("centerPanel")
 
         c_layout = QVBoxLayout(center_panel)
 
+        c_layout.setContentsMargins(0, 0, 0, 0)
+
+        c_layout.setSpacing(6)
+
        
 
         self.visualizer = SciFiReactor()
@@ -1110,6 +1668,8 @@ class MainWindow(QMainWindow):
 
         meter_layout = QHBoxLayout()
 
+        meter_layout.setContentsMargins(0, 0, 0, 0)
+
         self.lbl_in_meter = QLabel("IN: -Inf dB")
 
         self.lbl_out_meter = QLabel("OUT: -Inf dB")
@@ -1134,89 +1694,67 @@ class MainWindow(QMainWindow):
 
         right_panel.setFixedWidth(280)
 
-        right_panel.setStyleSheet("background: #111625; border-radius: 15px; border: 1px solid #223344;")
+        right_panel.setObjectName("sidePanel")
 
         r_layout = QVBoxLayout(right_panel)
 
-        r_layout.addWidget(QLabel("SOUND SIGNATURES"))
-
-       
-
-        scroll = QScrollArea()
+        r_layout.setContentsMargins(12, 12, 12, 12)
 
-        scroll.setWidgetResizable(True)
+        r_layout.setSpacing(6)
 
-        scroll.setStyleSheet("background: transparent; border: none;")
-
-       
-
-        p_widget = QWidget()
-
-        p_layout = QVBoxLayout(p_widget)
+        r_layout.addWidget(QLabel("SOUND SIGNATURES"))
 
        
 
-        for category, presets in PRESETS.items():
-
-            grp = QGroupBox(category)
+        # Model/view list: one delegate paints whatever rows are visible, no widget per preset
 
-            g_layout = QGridLayout(grp)
+        self.preset_view = QListView()
 
-            g_layout.setSpacing(8)
+        self.preset_view.setObjectName("presetList")
 
-           
+        self.preset_view.setModel(PresetModel(self.preset_view))
 
-            row, col = 0, 0
+        self.preset_view.setItemDelegate(PresetDelegate(self.preset_view))
 
-            for name, params in presets.items():
+        self.preset_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
-                # Extract emoji and name
+        self.preset_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
 
-                parts = name.split(" ", 1)
+        self.preset_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
-                short_name = parts[1] if len(parts) > 1 else name
+        self.preset_view.setMouseTracking(True)
 
-                emoji = parts[0]
+        self.preset_view.selectionModel().currentRowChanged.connect(self.on_preset_changed)
 
-               
+        r_layout.addWidget(self.preset_view)
 
-                btn = ModernButton(f"{emoji} {short_name}")
+       
 
-                btn.setCheckable(True)
+        main_layout.addWidget(right_panel)
 
-                btn.clicked.connect(lambda checked, n=name, p=params, b=btn: self.apply_preset(n, p, b))
 
-                g_layout.addWidget(btn, row, col)
 
-               
+    def selected_preset(self):
 
-                col += 1
+        return self._preset_idx
 
-                if col > 1:
 
-                    col = 0
 
-                    row += 1
+    def on_preset_changed(self, current, previous):
 
-           
-
-            p_layout.addWidget(grp)
-
-           
+        idx = current.data(PresetModel.ROW_ROLE)
 
-        p_layout.addStretch()
+        if idx is not None and idx >= 0: self._preset_idx = idx; self.apply_preset(idx)
 
-        scroll.setWidget(p_widget)
 
-        r_layout.addWidget(scroll)
 
-       
+    def refresh_devices(self):
 
-        main_layout.addWidget(right_panel)
+        self.scan_devices(refresh=True)
 
 
 
-    def scan_devices(self):
+    def scan_devices(self, refresh=False):
 
         self.combo_dev.clear()
 
@@ -1228,61 +1766,57 @@ class MainWindow(QMainWindow):
 
         try:
 
-            devs = sd.query_devices()
-
-            apis = sd.query_hostapis()
+            devs, apis = query_devices(refresh)
 
            
 
-            # Smart filtering for loopback free input/output pairs
-
-            valid_inputs = [i for i, d in enumerate(devs) if d['max_input_channels'] > 0]
+            # Smart filtering for loopback free input/output pairs, only devices sharing a host API
 
-            valid_outputs = [i for i, d in enumerate(devs) if d['max_output_channels'] > 0]
+            # and a sample rate can pair, so bucket them by (hostapi, rate) first
 
-           
+            buckets = defaultdict(lambda: ([], []))
 
-            for i_idx in valid_inputs:
+            for i, d in enumerate(devs):
 
-                for o_idx in valid_outputs:
+                key = (d['hostapi'], int(d['default_samplerate']))
 
-                    i_d = devs[i_idx]
+                if d['max_input_channels'] > 0: buckets[key][0].append(i)
 
-                    o_d = devs[o_idx]
+                if d['max_output_channels'] > 0: buckets[key][1].append(i)
 
-                   
+           
 
-                    if i_d['hostapi'] != o_d['hostapi']: continue
+            # Clean up names once per device, not once per pair
 
-                    if int(i_d['default_samplerate']) != int(o_d['default_samplerate']): continue
+            short = [d['name'][:20] for d in devs]
 
-                    if i_idx == o_idx: continue
+           
 
-                   
+            for (api, rate), (valid_inputs, valid_outputs) in buckets.items():
 
-                    api_name = apis[i_d['hostapi']]['name']
+                if not valid_inputs or not valid_outputs: continue
 
-                    # Clean up names
+                api_name = apis[api]['name']
 
-                    in_name = i_d['name'][:20]
+                for i_idx in valid_inputs:
 
-                    out_name = o_d['name'][:20]
+                    for o_idx in valid_outputs:
 
-                   
+                        if i_idx == o_idx: continue
 
-                    display = f"[{api_name}] {in_name}...  ➜  {out_name}..."
+                        display = "[%s] %s...  ➜  %s..." % (api_name, short[i_idx], short[o_idx])
 
-                   
+                       
 
-                    self.device_pairs.append({
+                        self.device_pairs.append({
 
-                        'in': i_idx, 'out': o_idx, 'rate': int(i_d['default_samplerate']),
+                            'in': i_idx, 'out': o_idx, 'rate': rate,
 
-                        'api': api_name
+                            'api': api_name
 
-                    })
+                        })
 
-                    self.combo_dev.addItem(display)
+                        self.combo_dev.addItem(display)
 
            
 
@@ -1308,27 +1842,17 @@ class MainWindow(QMainWindow):
 
             self.thread = None
 
-            self.btn_power.setText("INITIALIZE CORE")
+            self.processor = None
 
-            self.btn_power.setStyleSheet("""
-
-                QPushButton {
-
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #009977, stop:1 #00cc88);
-
-                    color: white; border: none; border-radius: 5px; font-weight: bold; font-size: 16px;
-
-                }
-
-                QPushButton:hover { background: #00ffaa; }
+            self.btn_power.setText("INITIALIZE CORE")
 
-            """)
+            self.btn_power.setStyleSheet(self._BTN_OFF_STYLE)
 
             self.lbl_status.setText("SYSTEM OFFLINE")
 
-            self.lbl_status.setStyleSheet("background: #220000; color: #ff5555; padding: 8px; border-radius: 4px; font-weight: bold;")
+            self.lbl_status.setStyleSheet(self._STATUS_OFF_STYLE)
 
-            self.visualizer.set_level(0)
+            self.update_meters(0.0, 0.0)
 
         else:
 
@@ -1344,61 +1868,59 @@ class MainWindow(QMainWindow):
 
            
 
-            self.processor = AudioProcessor(cfg['rate'], 4096)
+            # Current volume and preset go along, the thread builds the processor itself
 
-            self.processor.set_volume(self.slider_vol.value() / 100.0)
+            self.thread = AudioThread(cfg['in'], cfg['out'], cfg['rate'], mode,
 
-           
+                                      self.slider_vol.value() / 100.0, self.selected_preset())
 
-            # Re-apply preset if one was selected
+            self.thread.processor_ready.connect(self.attach_processor)
 
-            if self.active_preset_btn:
+            self.thread.levels_signal.connect(self.update_meters)
 
-                self.active_preset_btn.click()
+            self.thread.status_signal.connect(self.lbl_status.setText)
 
-           
+            self.thread.error_signal.connect(self.show_error)
 
-            self.thread = AudioThread(self.processor, cfg['in'], cfg['out'], cfg['rate'], mode)
+            self.thread.start(QThread.Priority.TimeCriticalPriority)
 
-            self.thread.status_signal.connect(lambda s: self.lbl_status.setText(s))
+           
 
-            self.thread.error_signal.connect(lambda e: QMessageBox.critical(self, "Core Error", e))
+            self.btn_power.setText("TERMINATE PROCESS")
 
-            self.thread.start()
+            self.btn_power.setStyleSheet(self._BTN_ON_STYLE)
 
-           
+            self.lbl_status.setStyleSheet(self._STATUS_ON_STYLE)
 
-            self.btn_power.setText("TERMINATE PROCESS")
 
-            self.btn_power.setStyleSheet("""
 
-                QPushButton { background: #550000; color: white; border: 1px solid #ff0000; border-radius: 5px; font-weight: bold; font-size: 16px; }
+    @pyqtSlot(str)
 
-                QPushButton:hover { background: #770000; }
+    def show_error(self, msg):
 
-            """)
+        QMessageBox.critical(self, "Core Error", msg)
 
-            self.lbl_status.setStyleSheet("background: #002211; color: #00ff88; padding: 8px; border-radius: 4px; font-weight: bold;")
 
 
+    def attach_processor(self, processor):
 
-    def apply_preset(self, name, params, btn):
+        self.processor = processor
 
-        if self.active_preset_btn:
+        # Catch up on anything changed while the thread was starting
 
-            self.active_preset_btn.setChecked(False)
+        processor.set_volume(self.slider_vol.value() / 100.0)
 
-       
+        idx = self.selected_preset()
 
-        self.active_preset_btn = btn
+        if idx >= 0: processor.set_preset(idx)
 
-        btn.setChecked(True)
 
-       
+
+    def apply_preset(self, idx):
 
         if self.processor:
 
-            self.processor.set_preset(params)
+            self.processor.set_preset(idx)
 
 
 
@@ -1410,25 +1932,57 @@ class MainWindow(QMainWindow):
 
 
 
-    def sync_ui(self):
+    def changeEvent(self, e):
 
-        if self.processor and self.thread and self.thread.isRunning():
+        if e.type() == QEvent.Type.WindowStateChange:
 
-            # Get audio level for visualizer (normalized roughly 0.0 to 1.0)
+            # Minimized: the reactor stops animating
 
-            lvl = min(1.0, self.processor.output_level * 1.5)
+            if self.isMinimized():
 
-            self.visualizer.set_level(lvl)
+                self.visualizer.timer.stop()
 
-           
+            else:
 
-            self.lbl_in_meter.setText(f"IN: {self.processor.input_level*100:.1f}%")
+                self.visualizer.timer.start(33)
 
-            self.lbl_out_meter.setText(f"OUT: {self.processor.output_level*100:.1f}%")
+        super().changeEvent(e)
 
-        else:
 
-            self.visualizer.set_level(0)
+
+    def update_meters(self, in_lvl, out_lvl):
+
+        # Pushed by the audio thread once per block, nothing to draw while hidden
+
+        if not self.isVisible() or self.isMinimized(): return
+
+        # Get audio level for visualizer (normalized roughly 0.0 to 1.0)
+
+        viz = int(min(1.0, out_lvl * 1.5) * 64)
+
+        if viz != self._last_viz:
+
+            self._last_viz = viz
+
+            self.visualizer.set_level(viz / 64.0)
+
+        # Only touch the labels when the displayed value actually changes
+
+        in_pct = int(in_lvl * 1000)
+
+        if in_pct != self._last_in_pct:
+
+            self._last_in_pct = in_pct
+
+            self.lbl_in_meter.setText(f"IN: {in_pct/10:.1f}%")
+
+        out_pct = int(out_lvl * 1000)
+
+        if out_pct != self._last_out_pct:
+
+            self._last_out_pct = out_pct
+
+            self.lbl_out_meter.setText(f"OUT: {out_pct/10:.1f}%")
 
 
 
@@ -1446,6 +2000,8 @@ if __name__ == "__main__":
 
     app.setFont(font)
 
+    app.setStyleSheet(APP_STYLE)
+
    
 
     window = MainWindow()
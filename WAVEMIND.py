@@ -11,11 +11,11 @@ Improvements:
 - 🖐️ DRAG & DROP: Drop files to play instantly (Temp Playlist).
 - 🚀 DATABASE LIBRARY: Uses SQLite to index folders. Zero RAM usage.
 - 🔍 SMART SEARCH: Instant filtering of your music library.
-- 💎 64-BIT PRECISION: All DSP runs in Float64.
+- 💎 32-BIT FLOAT DSP: Float32 samples, Float64 filter state and gain math.
 - 🔇 SILENT MODE: Suppresses console logs (FFmpeg/Qt).
 
 Dependencies:
-  pip install pyqt6 numpy
+  pip install pyqt6 numpy numba
 
 Run:
   python aura_ui_advanced.py
@@ -23,32 +23,49 @@ Run:
 
 from __future__ import annotations
 
+import functools
 import math
+import multiprocessing
 import os
+import queue
 import sys
 import wave
-import gc
-import time
 import random
+import re
 import sqlite3
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Optional, Any
 
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional, the DSP kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]): return args[0]
+        return lambda fn: fn
+
+# Sample type for decoded audio and the DSP chain, filter state stays float64
+DTYPE = np.float32
+
 try:
     from PyQt6.QtCore import (
-        Qt, QTimer, QSize, QRectF, QPointF, QThread, pyqtSignal, QObject, QMutex, QUrl
+        Qt, QTimer, QSize, QRectF, QPointF, QThread, pyqtSignal, QObject, QMutex, QUrl,
+        QAbstractItemModel, QModelIndex, QSortFilterProxyModel, QRegularExpression
     )
     from PyQt6.QtGui import (
-        QColor, QFont, QPainter, QPainterPath, QPen, QBrush,
+        QColor, QFont, QPainter, QPen, QBrush,
         QLinearGradient, QRadialGradient, QAction, QConicalGradient, QIcon,
-        QDragEnterEvent, QDropEvent
+        QDragEnterEvent, QDropEvent, QPixmap, QPolygonF
     )
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
         QLabel, QPushButton, QSlider, QFileDialog, QMessageBox,
-        QLineEdit, QTreeWidget, QTreeWidgetItem, QSplitter, QFrame,
+        QLineEdit, QTreeWidget, QTreeWidgetItem, QTreeView, QSplitter, QFrame,
         QDial, QComboBox, QGroupBox, QFormLayout, QCheckBox,
         QSizePolicy, QTextEdit, QProgressBar, QTabWidget, QListWidget, 
         QAbstractItemView, QHeaderView
@@ -174,91 +191,171 @@ PRESETS = {
     "💤 Sleep Mode": {"i": 0.40, "w": 0.60, "fx": ["Low-pass filter", "Volume leveling", "Crossfade"]},
 }
 
+@dataclass(frozen=True)
+class Preset:
+    i: float
+    w: float
+    fx: FrozenSet[str]
+
+# Freeze once at import, effect names interned so lookups compare by identity
+EFFECT = sys.intern
+PRESETS = {name: Preset(p["i"], p["w"], frozenset(EFFECT(fx) for fx in p["fx"])) for name, p in PRESETS.items()}
+
 
 # -----------------------------
 # Helpers: High-Fidelity WAV I/O
 # -----------------------------
 
-def read_wav(path: str) -> Tuple[np.ndarray, int]:
-    try:
-        with wave.open(path, "rb") as wf:
-            ch = wf.getnchannels()
-            sr = wf.getframerate()
-            sampwidth = wf.getsampwidth()
-            nframes = wf.getnframes()
-            raw = wf.readframes(nframes)
-        
-        if sampwidth == 1:
-            data = np.frombuffer(raw, dtype=np.uint8).astype(np.float64)
-            data -= 128.0; data /= 128.0
-        elif sampwidth == 2:
-            data = np.frombuffer(raw, dtype=np.int16).astype(np.float64)
-            data /= 32768.0
-        elif sampwidth == 3:
-            a = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
-            b = (a[:, 0].astype(np.int32) | (a[:, 1].astype(np.int32) << 8) | (a[:, 2].astype(np.int32) << 16))
-            mask = (b & 0x800000) != 0; b[mask] |= 0xFF000000
-            data = b.astype(np.float64) / 8388608.0
-        elif sampwidth == 4:
-            data = np.frombuffer(raw, dtype=np.int32).astype(np.float64) / 2147483648.0
-        else:
-            raise ValueError(f"Unsupported bit depth: {sampwidth*8}")
-
-        if ch > 1: data = data.reshape(-1, ch)
-        else: data = data.reshape(-1, 1)
-
-        del raw; gc.collect()
-        return np.clip(data, -1.0, 1.0), sr
-    except Exception as e:
-        raise IOError(f"Read error: {e}")
+def _wav_layout(path: str) -> Tuple[int, int, int, int, int]:
+    # Walk the RIFF chunks: (channels, rate, sample width, data offset, data bytes)
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE": raise ValueError("Not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            head = f.read(8)
+            if len(head) < 8: raise ValueError("No data chunk")
+            cid, size = struct.unpack("<4sI", head)
+            if cid == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", f.read(16)); f.seek(size - 16 + (size & 1), 1)
+            elif cid == b"data":
+                if fmt is None: raise ValueError("Data before fmt chunk")
+                tag, ch, sr, _, _, bits = fmt
+                if tag not in (1, 0xFFFE): raise ValueError(f"Unsupported format tag: {tag}")
+                offset = f.tell()
+                size = min(size, os.fstat(f.fileno()).st_size - offset)
+                return ch, sr, bits // 8, offset, size - size % (ch * (bits // 8))
+            else:
+                f.seek(size + (size & 1), 1)
+
+# Serial and GIL-free: the loader, the exporter and tempo estimation may decode at the same time
+@njit(cache=True, nogil=True)
+def _pcm_to_float_kernel(src, bias, scale, out):
+    for i in range(src.shape[0]):
+        out[i] = (src[i] - bias) * scale
+
+@njit(cache=True, nogil=True)
+def _pcm24_to_float_kernel(src, out):
+    # Little-endian 3-byte samples, sign taken from the top byte
+    for i in range(out.shape[0]):
+        j = 3 * i
+        v = np.int32(src[j]) | (np.int32(src[j + 1]) << 8) | (np.int32(src[j + 2]) << 16)
+        if v >= 8388608: v -= 16777216
+        out[i] = v * (1.0 / 8388608.0)
 
+@dataclass
+class WavMap:
+    # Read-only map of a WAV data chunk: (frames, ch) integer samples, or (frames, ch*3) bytes for 24-bit
+    pcm: np.ndarray
+    sr: int
+    sampwidth: int
+    channels: int
 
-def write_wav(path: str, audio: np.ndarray, sr: int) -> None:
-    audio = np.clip(audio, -1.0, 1.0)
-    pcm = (audio * 2147483647.0).astype(np.int32)
-    ch = 1 if pcm.ndim == 1 else pcm.shape[1]
+    @property
+    def frames(self) -> int: return self.pcm.shape[0]
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        # Decode frames [start, stop) to DTYPE; only this block is paged in from the file
+        block = self.pcm[start:stop]
+        out = np.empty((block.shape[0], self.channels), dtype=DTYPE)
+        if out.size:
+            src = block.reshape(-1); flat = out.reshape(-1)
+            if self.sampwidth == 1: _pcm_to_float_kernel(src, 128.0, 1.0 / 128.0, flat)
+            elif self.sampwidth == 2: _pcm_to_float_kernel(src, 0.0, 1.0 / 32768.0, flat)
+            elif self.sampwidth == 3: _pcm24_to_float_kernel(src, flat)
+            else: _pcm_to_float_kernel(src, 0.0, 1.0 / 2147483648.0, flat)
+        # Integer PCM scaled by its full range is already within [-1, 1)
+        return out
+
+def map_wav(path: str) -> WavMap:
+    ch, sr, sampwidth, offset, nbytes = _wav_layout(path)
+    if sampwidth not in (1, 2, 3, 4): raise ValueError(f"Unsupported bit depth: {sampwidth*8}")
+    dtype = {1: np.uint8, 2: np.int16, 3: np.uint8, 4: np.int32}[sampwidth]
+    shape = (nbytes // (ch * sampwidth), ch * 3 if sampwidth == 3 else ch)
+    # np.memmap refuses empty ranges
+    pcm = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape) if shape[0] else np.zeros(shape, dtype=dtype)
+    return WavMap(pcm, sr, sampwidth, ch)
+
+
+def _pcm32_bytes(block: np.ndarray) -> bytes:
+    # float32 rounds 2**31 - 1 up to 2**31, so scale in float64
+    return (np.clip(np.asarray(block, dtype=np.float64), -1.0, 1.0) * 2147483647.0).astype(np.int32).tobytes()
+
+def write_wav(path: str, blocks: Iterable[np.ndarray], sr: int, channels: int) -> None:
     with wave.open(path, "wb") as wf:
-        wf.setnchannels(ch); wf.setsampwidth(4); wf.setframerate(sr)
-        wf.writeframes(pcm.tobytes())
-    del pcm; gc.collect()
+        wf.setnchannels(channels); wf.setsampwidth(4); wf.setframerate(sr)
+        # Convert a block of frames at a time so only one block of PCM exists at once
+        for block in blocks:
+            wf.writeframes(_pcm32_bytes(block))
 
 
 # -----------------------------
-# DSP Primitives (Optimized Float64)
+# DSP Primitives (Float32 samples)
 # -----------------------------
 
 def db_to_lin(db: float) -> float:
     return float(10.0 ** (db / 20.0))
 
-def one_pole_low_shelf(x: np.ndarray, sr: int, freq: float, gain_db: float) -> np.ndarray:
-    if gain_db == 0.0: return x
-    g = db_to_lin(gain_db)
-    alpha = math.exp(-2.0 * math.pi * freq / max(sr, 1))
-    y = np.empty_like(x)
-    coeff_b = 1.0 - alpha
-    z = np.zeros(x.shape[1], dtype=np.float64)
-    for i in range(len(x)):
-        z = alpha * z + coeff_b * x[i]
-        y[i] = x[i] + (g - 1.0) * z
-    return y
-
-def simple_compressor(x: np.ndarray, threshold_db: float, ratio: float) -> np.ndarray:
-    env = np.abs(x)
-    env_db = 20.0 * np.log10(np.maximum(env, 1e-12))
-    over_mask = env_db > threshold_db
-    gain_db = np.zeros_like(env_db)
-    diff = env_db[over_mask] - threshold_db
-    gain_db[over_mask] = -diff * (1.0 - 1.0/max(ratio, 1.0))
-    gain_lin = np.power(10.0, gain_db / 20.0)
-    return x * gain_lin
-
-def stereo_widen(x: np.ndarray, amount: float) -> np.ndarray:
-    if x.shape[1] < 2: return x
-    mid = 0.5 * (x[:, 0] + x[:, 1]); side = 0.5 * (x[:, 0] - x[:, 1])
-    side *= (1.0 + amount)
-    res = np.empty_like(x)
-    res[:, 0] = mid + side; res[:, 1] = mid - side
-    return res
+def estimate_bpm(path: str, seconds: float = 30.0) -> Optional[float]:
+    # Autocorrelation of an onset envelope over a mid-file excerpt; WAV only, None when no clear beat stands out
+    if os.path.splitext(path)[1].lower() != ".wav": return None
+    try:
+        m = map_wav(path)
+        n = int(seconds * m.sr); start = max(0, (m.frames - n) // 2)
+        x = m.read(start, start + n).mean(axis=1, dtype=np.float64)
+    except Exception:
+        return None
+    hop = 512; frames = len(x) // hop
+    if frames < 256: return None
+    energy = np.square(x[:frames * hop]).reshape(frames, hop).sum(axis=1)
+    onset = np.maximum(np.diff(np.log1p(1000.0 * energy)), 0.0); onset -= onset.mean()
+    spec = np.fft.rfft(onset, 2 * len(onset)); ac = np.fft.irfft(spec * np.conj(spec))[:len(onset)]
+    fps = m.sr / hop
+    lo, hi = math.ceil(fps * 60.0 / 180.0), int(fps * 60.0 / 60.0) + 1 # 60-180 BPM
+    if hi >= len(ac): return None
+    lags = np.arange(lo, hi)
+    prior = np.exp(-0.5 * np.log2(60.0 * fps / lags / 120.0) ** 2 / 0.25) # favour ~120 BPM against octave errors
+    lag = lo + int(np.argmax(ac[lo:hi] * prior))
+    # Noise and beatless material peak at ~2-3x the band's mean magnitude, steady beats at 6x and up
+    if ac[lag] <= 4.0 * np.mean(np.abs(ac[lo:hi])): return None
+    return 60.0 * fps / lag
+
+# Effect bits for the fused chain kernel
+FX_GAIN, FX_BASS, FX_COMP, FX_LIMIT, FX_WIDEN = 1, 2, 4, 8, 16
+
+# Source for the fused chain: the stages are spliced in per enabled-effect mask
+_CHAIN_TEMPLATE = """
+def chain(audio, out, z, gain, alpha, coeff_b, shelf_g, thr_lin, slope, width, wet):
+    n, ch = audio.shape
+    y = np.zeros(ch, dtype=np.float64)
+    for i in range(n):
+        for c in range(ch):
+            v = audio[i, c]
+{stages}            y[c] = v
+{widen}        for c in range(ch):
+            v = y[c] * wet + audio[i, c] * (1.0 - wet) if wet < 1.0 else y[c]
+            out[i, c] = min(max(v, -1.0), 1.0)
+"""
+_CHAIN_STAGES = (
+    (FX_GAIN, "v *= gain"),
+    (FX_BASS, "z[c] = alpha * z[c] + coeff_b * v", "v += (shelf_g - 1.0) * z[c]"),
+    (FX_COMP, "a = abs(v)", "if a > thr_lin: v *= (a / thr_lin) ** -slope"),
+    (FX_LIMIT, "v = min(max(v, -0.98), 0.98)"),
+)
+_CHAIN_WIDEN = ("if ch >= 2:", "    mid = 0.5 * (y[0] + y[1]); side = 0.5 * (y[0] - y[1]) * (1.0 + width)",
+                "    y[0] = mid + side; y[1] = mid - side")
+_chain_kernels: Dict[int, Any] = {}
+
+def _chain_kernel(flags: int):
+    # gain -> low shelf -> compressor -> limiter -> widen -> wet/dry -> clip, with the disabled stages left out
+    kernel = _chain_kernels.get(flags)
+    if kernel is None:
+        stages = "".join(" " * 12 + line + "\n" for bit, *lines in _CHAIN_STAGES if flags & bit for line in lines)
+        widen = "".join(" " * 8 + line + "\n" for line in _CHAIN_WIDEN) if flags & FX_WIDEN else ""
+        ns = {"np": np}
+        exec(_CHAIN_TEMPLATE.format(stages=stages, widen=widen), ns)
+        kernel = _chain_kernels[flags] = njit(fastmath=True)(ns["chain"])
+    return kernel
 
 
 # -----------------------------
@@ -267,61 +364,141 @@ def stereo_widen(x: np.ndarray, amount: float) -> np.ndarray:
 
 class LibraryManager:
     DB_NAME = "aura_library.db"
-    def __init__(self): self.init_db()
+    def __init__(self):
+        # One long-lived connection so SQLite's statement cache keeps the query plans
+        self._conn = sqlite3.connect(self.DB_NAME, check_same_thread=False)
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY", "cache_size=-20000"):
+            self._conn.execute(f"PRAGMA {pragma}")
+        self.init_db()
     def init_db(self):
-        with sqlite3.connect(self.DB_NAME) as conn:
-            conn.execute('CREATE TABLE IF NOT EXISTS tracks (id INTEGER PRIMARY KEY, path TEXT UNIQUE, filename TEXT, folder TEXT)')
+        with self._conn as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS tracks (id INTEGER PRIMARY KEY, path TEXT UNIQUE, filename TEXT, folder TEXT, bpm REAL)')
+            if 'bpm' not in [r[1] for r in conn.execute('PRAGMA table_info(tracks)')]: conn.execute('ALTER TABLE tracks ADD COLUMN bpm REAL')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tracks_folder_filename ON tracks(folder, filename)')
     def add_track(self, path):
         try:
-            with sqlite3.connect(self.DB_NAME) as conn:
+            with self._conn as conn:
                 conn.execute('INSERT INTO tracks (path, filename, folder) VALUES (?, ?, ?)', (path, os.path.basename(path), os.path.basename(os.path.dirname(path))))
         except sqlite3.IntegrityError: pass
-    def get_folders(self, filter_text=None):
-        with sqlite3.connect(self.DB_NAME) as conn:
-            sql = 'SELECT DISTINCT folder FROM tracks'
-            if filter_text: sql += f" WHERE filename LIKE '%{filter_text}%' OR folder LIKE '%{filter_text}%'"
-            sql += ' ORDER BY folder'
-            return [r[0] for r in conn.execute(sql).fetchall()]
-    def get_tracks_in_folder(self, folder, filter_text=None):
-        with sqlite3.connect(self.DB_NAME) as conn:
-            sql = 'SELECT filename, path FROM tracks WHERE folder = ?'
-            if filter_text: sql += f" AND (filename LIKE '%{filter_text}%' OR folder LIKE '%{filter_text}%')"
-            sql += ' ORDER BY filename'
-            return conn.execute(sql, (folder,)).fetchall()
+    def add_tracks(self, rows, chunk=1000):
+        # rows: (path, filename, folder) tuples, committed in a single transaction
+        with self._conn as conn:
+            for i in range(0, len(rows), chunk):
+                conn.executemany('INSERT OR IGNORE INTO tracks (path, filename, folder) VALUES (?, ?, ?)', rows[i:i + chunk])
+    def get_bpm(self, path):
+        row = self._conn.execute('SELECT bpm FROM tracks WHERE path = ?', (path,)).fetchone()
+        return row[0] if row else None
+    def set_bpm(self, path, bpm):
+        with self._conn as conn: conn.execute('UPDATE tracks SET bpm = ? WHERE path = ?', (bpm, path))
+    def get_library(self):
+        # [(folder, [(filename, path), ...]), ...] from a single ordered scan
+        lib = []
+        for folder, name, path in self._conn.execute('SELECT folder, filename, path FROM tracks ORDER BY folder, filename'):
+            if not lib or lib[-1][0] != folder: lib.append((folder, []))
+            lib[-1][1].append((name, path))
+        return lib
+
+
+class LibraryModel(QAbstractItemModel):
+    # Two levels over cached rows: folders (internal id 0) and tracks (internal id = folder row + 1)
+    def __init__(self, parent=None): super().__init__(parent); self._folders = []
+    def set_library(self, folders):
+        self.beginResetModel(); self._folders = folders; self.endResetModel()
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent): return QModelIndex()
+        return self.createIndex(row, column, parent.row() + 1 if parent.isValid() else 0)
+    def parent(self, index=None):
+        if index is None: return super().parent()
+        if not index.isValid() or index.internalId() == 0: return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid(): return len(self._folders)
+        if parent.internalId() == 0 and parent.column() == 0: return len(self._folders[parent.row()][1])
+        return 0
+    def columnCount(self, parent=QModelIndex()): return 1
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        fid = index.internalId()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._folders[index.row()][0] if fid == 0 else self._folders[fid - 1][1][index.row()][0]
+        if role == Qt.ItemDataRole.UserRole and fid: return self._folders[fid - 1][1][index.row()][1]
+        return None
+    def flags(self, index):
+        if not index.isValid(): return Qt.ItemFlag.NoItemFlags
+        if index.internalId() == 0: return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal: return "My Library"
+        return None
+
+@functools.lru_cache(maxsize=64)
+def _compile_filter(pat: str) -> QRegularExpression:
+    # Search text with * / ? wildcards -> case-insensitive substring regex, built once per pattern
+    regex = re.escape(pat).replace(r'\*', '.*').replace(r'\?', '.')
+    return QRegularExpression(regex, QRegularExpression.PatternOption.CaseInsensitiveOption)
 
 
 # -----------------------------
 # Threading Workers
 # -----------------------------
 
-class LibraryScanner(QObject):
-    finished = pyqtSignal(int)
-    def __init__(self, root_path): super().__init__(); self.root_path = root_path; self.db = LibraryManager()
-    def run(self):
-        count = 0
-        for root, _, files in os.walk(self.root_path):
-            for file in files:
-                if file.lower().endswith(('.wav', '.mp3', '.flac', '.ogg', '.m4a')):
-                    self.db.add_track(os.path.join(root, file))
-                    count += 1
-        self.finished.emit(count)
+# File types accepted by the library scan and drag & drop
+_AUDIO_EXTS = frozenset({'.wav', '.mp3', '.flac', '.ogg', '.m4a'})
+
+def _walk_tree(top, split=False):
+    # (path, filename, folder) rows under top; with split, subdirectories are returned instead of walked
+    rows = []; subdirs = []; stack = [top]
+    while stack:
+        root = stack.pop(); folder = os.path.basename(root)
+        try: entries = os.scandir(root)
+        except OSError: continue
+        with entries:
+            for e in entries:
+                if e.is_dir(follow_symlinks=False): (subdirs if split else stack).append(e.path)
+                elif os.path.splitext(e.name)[1].lower() in _AUDIO_EXTS:
+                    rows.append((e.path, e.name, folder))
+    return rows, subdirs
+
+def _scan_worker(root_path, out_q, batch=1000):
+    # Runs in a child process. Queue items: row batches, (done, total) progress, None when finished
+    rows, subdirs = _walk_tree(root_path, split=True)
+    if rows: out_q.put(rows)
+    # Each top-level subtree is walked on its own thread so directory I/O latency overlaps
+    with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as pool:
+        for done, fut in enumerate(as_completed([pool.submit(_walk_tree, d) for d in subdirs]), 1):
+            rows = fut.result()[0]
+            for i in range(0, len(rows), batch): out_q.put(rows[i:i + batch])
+            out_q.put((done, len(subdirs)))
+    out_q.put(None)
 
 class AudioLoader(QObject):
     finished = pyqtSignal(object, int, str); error = pyqtSignal(str)
-    def load(self, path):
+    def __init__(self, path): super().__init__(); self.path = path
+    def run(self):
         try:
-            data, sr = read_wav(path)
-            self.finished.emit(data, sr, path)
+            data = map_wav(self.path)
+            self.finished.emit(data, data.sr, self.path)
         except Exception as e: self.error.emit(str(e))
 
 class AudioProcessor(QObject):
-    finished = pyqtSignal(object); error = pyqtSignal(str)
-    def __init__(self, engine, audio, sr): super().__init__(); self.engine = engine; self.audio = audio; self.sr = sr
+    finished = pyqtSignal(str); error = pyqtSignal(str)
+    def __init__(self, engine, source, path, block=65536): super().__init__(); self.engine = engine; self.source = source; self.path = path; self.block = block
     def run(self):
+        # Render next to the target and swap it in at the end, so a failed export never leaves a half-written file
+        tmp = None
         try:
-            res = self.engine.apply_chain(self.audio, self.sr)
-            self.finished.emit(res); del res; gc.collect()
-        except Exception as e: self.error.emit(str(e))
+            fd, tmp = tempfile.mkstemp(suffix=".wav", dir=os.path.dirname(os.path.abspath(self.path))); os.close(fd)
+            # Decode, process and write one block at a time; the shelf state carries across blocks
+            src = self.source; z = np.zeros(src.channels)
+            blocks = (self.engine.apply_chain(src.read(i, i + self.block), src.sr, z) for i in range(0, src.frames, self.block))
+            write_wav(tmp, blocks, src.sr, src.channels)
+            os.replace(tmp, self.path)
+            self.finished.emit(self.path)
+        except Exception as e:
+            if tmp is not None:
+                try: os.remove(tmp)
+                except OSError: pass
+            self.error.emit(str(e))
 
 
 # -----------------------------
@@ -335,52 +512,76 @@ class EngineState:
     wet_dry: float
 
 class EffectEngine:
-    def __init__(self): self.state = EngineState(enabled={}, global_intensity=0.72, wet_dry=0.60)
+    def __init__(self): self.state = EngineState(enabled={}, global_intensity=0.72, wet_dry=0.60); self._scratch = None
     def set_enabled(self, name, value): self.state.enabled[name] = bool(value)
     def is_enabled(self, name): return self.state.enabled.get(name, False)
-    def apply_chain(self, audio, sr):
-        dry = audio; y = audio.copy(); I = self.state.global_intensity
-        if self.is_enabled("Gain"): y *= db_to_lin(-6.0 + 18.0 * I)
-        if self.is_enabled("Bass boost"): y = one_pole_low_shelf(y, sr, 120.0, 4.0 * I)
-        if self.is_enabled("Compressor"): y = simple_compressor(y, -12.0 - (6.0*I), 2.5 + I)
-        if self.is_enabled("Peak limiter") or self.is_enabled("Limiter"): np.clip(y, -0.98, 0.98, out=y)
-        if self.is_enabled("Stereo widening"): y = stereo_widen(y, 0.3 * I)
-        wet = self.state.wet_dry
-        if wet < 1.0: y = y * wet + dry * (1.0 - wet)
-        return np.clip(y, -1.0, 1.0)
+    def _out_buffer(self, shape):
+        # Grows to the largest render seen and is reused afterwards
+        s = self._scratch
+        if s is None or s.shape[0] < shape[0] or s.shape[1] != shape[1]:
+            s = self._scratch = np.empty((max(shape[0], 0 if s is None else s.shape[0]), shape[1]), dtype=DTYPE)
+        return s[:shape[0]]
+    def apply_chain(self, audio, sr, z=None):
+        # The result is a view of the engine's scratch buffer, valid until the next call.
+        # z holds the per-channel shelf state; pass the same array to render a file block by block
+        I = self.state.global_intensity
+        flags = 0
+        if self.is_enabled("Gain"): flags |= FX_GAIN
+        if self.is_enabled("Bass boost") and I != 0.0: flags |= FX_BASS
+        if self.is_enabled("Compressor"): flags |= FX_COMP
+        if self.is_enabled("Peak limiter") or self.is_enabled("Limiter"): flags |= FX_LIMIT
+        if self.is_enabled("Stereo widening"): flags |= FX_WIDEN
+        # 120 Hz low shelf; gain, shelf boost, threshold, ratio and width all scale with intensity
+        alpha = math.exp(-2.0 * math.pi * 120.0 / max(sr, 1))
+        audio = np.ascontiguousarray(audio, dtype=DTYPE); out = self._out_buffer(audio.shape)
+        if z is None: z = np.zeros(audio.shape[1])
+        _chain_kernel(flags)(audio, out, z, db_to_lin(-6.0 + 18.0 * I), alpha, 1.0 - alpha, db_to_lin(4.0 * I),
+                            db_to_lin(-12.0 - (6.0*I)), 1.0 - 1.0/max(2.5 + I, 1.0), 0.3 * I, self.state.wet_dry)
+        return out
 
 class AuraOrb(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent); self.setMinimumSize(400, 320); self.phase = 0.0; self.is_playing = False; self.pulse = 0.0
-        self.timer = QTimer(self); self.timer.timeout.connect(self._animate); self.timer.start(16)
-        self.cpu_load = 0.0; self.ram_load = 0.0
-    def set_playing(self, playing): self.is_playing = playing
+        self.timer = QTimer(self); self.timer.timeout.connect(self._animate); self.timer.start(120)
+        self.cpu_load = 0.0; self.ram_load = 0.0; self._bg_cache: Optional[QPixmap] = None
+        self._ring_t = np.arange(101) * (6.28 / 100) # ring sample angles, shared by every ring and frame
+    def set_playing(self, playing):
+        # 30 fps while playing, ~8 fps idle; colours change, so repaint everything once
+        if playing != self.is_playing: self.timer.setInterval(33 if playing else 120); self.update()
+        self.is_playing = playing
     def _animate(self):
-        self.phase += 0.08 if self.is_playing else 0.02
+        step = self.timer.interval() / 16.0 # phase speed is tuned per 16 ms tick
+        self.phase += (0.08 if self.is_playing else 0.02) * step
         self.pulse = (math.sin(self.phase * 2.0) + 1.0) * (0.8 if self.is_playing else 0.5)
         self.cpu_load = 12.0 + math.sin(self.phase * 5) * 2; self.ram_load = 4.0 + math.cos(self.phase * 3)
-        self.update()
-    def paintEvent(self, e):
-        p = QPainter(self); p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Only the orb (its glow is the widest part) changes between frames
         w, h = self.width(), self.height(); cx, cy = w/2, h/2 - 20; radius = min(w, h) * 0.25
+        self.update(QRectF(cx - radius*2.5, cy - radius*2.0, radius*5.0, radius*4.0).toAlignedRect().adjusted(-2, -2, 2, 2))
+    def resizeEvent(self, e):
+        # Gradient + grid only depend on the size: render once, blit every frame
+        w, h = self.width(), self.height(); dpr = self.devicePixelRatioF()
+        self._bg_cache = QPixmap(int(w * dpr), int(h * dpr)); self._bg_cache.setDevicePixelRatio(dpr)
+        p = QPainter(self._bg_cache)
         bg = QLinearGradient(0,0,0,h); bg.setColorAt(0, QColor(5,8,15)); bg.setColorAt(1, QColor(10,14,24)); p.fillRect(0,0,w,h,bg)
         p.setPen(QPen(QColor(40,60,90,40), 1))
         for i in range(0, w, 40): p.drawLine(i, 0, i, h)
         for i in range(0, h, 40): p.drawLine(0, i, w, i)
+        p.end(); super().resizeEvent(e)
+    def paintEvent(self, e):
+        p = QPainter(self); p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        w, h = self.width(), self.height(); cx, cy = w/2, h/2 - 20; radius = min(w, h) * 0.25
+        if self._bg_cache is not None: p.drawPixmap(0, 0, self._bg_cache)
         glow = QRadialGradient(cx, cy, radius*2.5)
         glow.setColorAt(0, QColor(0,255,200,40) if self.is_playing else QColor(100,200,255,20))
         glow.setColorAt(0.6, Qt.GlobalColor.transparent); p.setBrush(QBrush(glow)); p.setPen(Qt.PenStyle.NoPen); p.drawEllipse(QPointF(cx, cy), radius*2.5, radius*2.0)
         
+        wob = (5+self.pulse*5) if self.is_playing else (5+self.pulse*2)
         def ring(sc, off, col, wid):
-            path = QPainterPath(); r_b = radius * sc
-            for i in range(101):
-                a = (i/100)*6.28 + off + self.phase
-                wob = (5+self.pulse*5) if self.is_playing else (5+self.pulse*2)
-                r = r_b + math.sin(a*3 + self.phase*2) * wob
-                x = cx + math.cos(a)*r; y = cy + math.sin(a)*r*0.85
-                if i==0: path.moveTo(x,y)
-                else: path.lineTo(x,y)
-            p.setPen(QPen(col, wid)); p.setBrush(Qt.BrushStyle.NoBrush); p.drawPath(path)
+            # All 101 points in one vectorised pass instead of per-point math.sin/cos
+            a = self._ring_t + (off + self.phase)
+            r = radius * sc + np.sin(a*3 + self.phase*2) * wob
+            xs = (cx + np.cos(a)*r).tolist(); ys = (cy + np.sin(a)*r*0.85).tolist()
+            p.setPen(QPen(col, wid)); p.setBrush(Qt.BrushStyle.NoBrush); p.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
 
         c1 = QColor(0,255,100,120) if self.is_playing else QColor(0,255,255,100)
         c2 = QColor(255,50,200,100) if self.is_playing else QColor(255,0,255,80)
@@ -410,8 +611,8 @@ QSlider::sub-page:horizontal { background: #00aaff; border-radius: 3px; }
 QTabWidget::pane { border: none; }
 QTabBar::tab { background: rgba(30, 45, 70, 0.6); color: #88ccff; padding: 8px 16px; border-top-left-radius: 8px; border-top-right-radius: 8px; margin-right: 2px; }
 QTabBar::tab:selected { background: rgba(50, 80, 120, 0.9); color: #fff; border-bottom: 2px solid #00ffff; }
-QTreeWidget, QListWidget { background: rgba(10, 15, 25, 0.5); border: none; font-size: 13px; }
-QTreeWidget::item:selected { background: rgba(0, 150, 255, 0.3); color: #fff; }
+QTreeWidget, QTreeView, QListWidget { background: rgba(10, 15, 25, 0.5); border: none; font-size: 13px; }
+QTreeWidget::item:selected, QTreeView::item:selected { background: rgba(0, 150, 255, 0.3); color: #fff; }
 QLineEdit { background: #0a1018; border: 1px solid #335577; border-radius: 6px; padding: 4px; }
 QProgressBar { border: 1px solid #335577; border-radius: 6px; text-align: center; }
 QProgressBar::chunk { background-color: #00ffff; }
@@ -428,31 +629,46 @@ class AuraApp(QMainWindow):
         self.player_a = QMediaPlayer(); self.out_a = QAudioOutput(); self.player_a.setAudioOutput(self.out_a)
         self.player_b = QMediaPlayer(); self.out_b = QAudioOutput(); self.player_b.setAudioOutput(self.out_b)
         self.active_player = 0 # 0=A, 1=B
+        self._deck_duration = [0, 0] # ms, from durationChanged so position ticks don't query the player
+        self._total_str = "0:00"; self._time_txt = "" # Total side of the time label, and the label's current text
         self.master_volume = 1.0 # 0.0 to 1.0
         
         # Connect signals for both players
         for p in [self.player_a, self.player_b]:
             p.mediaStatusChanged.connect(self._on_media_status_changed)
             p.playbackStateChanged.connect(self._on_playback_state_changed)
+            p.errorOccurred.connect(self._on_player_error)
         
-        # Crossfader
-        self.cross_timer = QTimer(self); self.cross_timer.setInterval(100); self.cross_timer.timeout.connect(self._crossfade_step)
-        self.is_crossfading = False
-        self.xfade_duration = 4000 # ms
-        self.monitor_timer = QTimer(self); self.monitor_timer.setInterval(500); self.monitor_timer.timeout.connect(self._check_xfade_trigger)
-        self.monitor_timer.start()
+        # Crossfader: triggered by the outgoing deck's position, ramped by the incoming deck's
+        self.is_crossfading = False; self._crossfade_on = False # Mirrors the "Crossfade" effect item
+        self.xfade_default = 4000 # ms, used when the outgoing track's tempo is unknown
+        self.xfade_duration = self.xfade_default
+        # Tempo-matched fades: BPM per path (None = unknown), estimated off the GUI thread on first play.
+        # Its WAV decode can overlap an export's, the decode kernels are serial and nogil so that is safe
+        self.track_bpm: Dict[str, Optional[float]] = {}; self._bpm_jobs = {}; self._bpm_pool = ThreadPoolExecutor(max_workers=1)
+        self._active_path = None; self._incoming_path = None; self._xfade_for = None
+        self._preloaded_idx = -1 # playlist index already loaded into the idle deck
+        self._preload_failed = False # the idle deck couldn't open it, leave the load to _play_current
         
         # Link main UI seek bar to active player
-        self.player_a.positionChanged.connect(lambda p: self._on_position_changed(p, 0))
-        self.player_b.positionChanged.connect(lambda p: self._on_position_changed(p, 1))
-        self.player_a.durationChanged.connect(lambda d: self._on_duration_changed(d, 0))
-        self.player_b.durationChanged.connect(lambda d: self._on_duration_changed(d, 1))
+        self.player_a.positionChanged.connect(self._pos_a)
+        self.player_b.positionChanged.connect(self._pos_b)
+        self.player_a.durationChanged.connect(self._dur_a)
+        self.player_b.durationChanged.connect(self._dur_b)
 
         self.is_slider_dragging = False; self.current_playlist = []; self.current_index = -1; self.audio_data = None; self.effect_items = {}
+        # Enabled effect names kept in step with the tree; Custom slot saves are coalesced
+        self._enabled_set = set()
+        self._save_timer = QTimer(self); self._save_timer.setSingleShot(True); self._save_timer.setInterval(100); self._save_timer.timeout.connect(self._save_to_custom)
         
         # Shuffle/Loop State
         self.shuffle_state = False
         self.loop_state = 1 # 0=Off, 1=All, 2=One
+        self._shuffle_order = []; self._shuffle_pos = 0 # playlist permutation walked while shuffling
+        
+        # Library scan process and the timer feeding its rows into the DB
+        self.scan_proc = None; self.scan_q = None
+        self.scan_timer = QTimer(self); self.scan_timer.setInterval(50); self.scan_timer.timeout.connect(self._drain_scan)
         
         self._init_ui()
 
@@ -555,9 +771,17 @@ class AuraApp(QMainWindow):
         
         # Library Tab
         tab2 = QWidget(); t2 = QVBoxLayout(tab2); t2.setContentsMargins(0,10,0,0)
-        self.lib_search = QLineEdit(); self.lib_search.setPlaceholderText("🔍 Search Library..."); self.lib_search.textChanged.connect(self._refresh_lib)
-        self.lib_tree = QTreeWidget(); self.lib_tree.setHeaderLabel("My Library"); self.lib_tree.itemDoubleClicked.connect(self._lib_dbl_click)
-        row2 = QHBoxLayout(); scan_b = QPushButton("📂 Select Folder"); scan_b.clicked.connect(self._scan); ref_b = QPushButton("Refresh"); ref_b.clicked.connect(lambda: self._refresh_lib(""))
+        self.lib_search = QLineEdit(); self.lib_search.setPlaceholderText("🔍 Search Library..."); self.lib_search.textChanged.connect(lambda _t: self._search_timer.start())
+        # Keystrokes restart the timer, the query runs once typing pauses
+        self._search_timer = QTimer(self); self._search_timer.setSingleShot(True); self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self._run_search); self._last_txt = ""
+        # Library rows live in a model, searching only flips proxy visibility
+        self.lib_model = LibraryModel(self); self.lib_proxy = QSortFilterProxyModel(self); self.lib_proxy.setSourceModel(self.lib_model)
+        self.lib_proxy.setRecursiveFilteringEnabled(True); self.lib_proxy.setAutoAcceptChildRows(True)
+        self.lib_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.lib_tree = QTreeView(); self.lib_tree.setModel(self.lib_proxy); self.lib_tree.setUniformRowHeights(True)
+        self.lib_tree.doubleClicked.connect(self._lib_dbl_click)
+        row2 = QHBoxLayout(); scan_b = QPushButton("📂 Select Folder"); scan_b.clicked.connect(self._scan); ref_b = QPushButton("Refresh"); ref_b.clicked.connect(self._refresh_lib)
         row2.addWidget(scan_b); row2.addWidget(ref_b); t2.addWidget(self.lib_search); t2.addWidget(self.lib_tree); t2.addLayout(row2)
         self.tabs.addTab(tab2, "Library")
         
@@ -572,21 +796,30 @@ class AuraApp(QMainWindow):
 
     def dropEvent(self, event):
         files = [u.toLocalFile() for u in event.mimeData().urls()]
-        valid = [f for f in files if f.lower().endswith(('.wav', '.mp3', '.flac', '.ogg', '.m4a'))]
+        valid = [f for f in files if os.path.splitext(f)[1].lower() in _AUDIO_EXTS]
         if valid:
             self.current_playlist = valid
             self.current_index = 0
+            if self.shuffle_state: self._reshuffle()
             self._play_current()
             # If single WAV, load for processing too
             if len(valid) == 1 and valid[0].lower().endswith(".wav"):
-                self.ld = AudioLoader(); self.th = QThread(); self.ld.moveToThread(self.th)
-                self.th.started.connect(lambda: self.ld.load(valid[0])); self.ld.finished.connect(self._loaded)
+                self.ld = AudioLoader(valid[0]); self.th = QThread(); self.ld.moveToThread(self.th)
+                self.th.started.connect(self.ld.run); self.ld.finished.connect(self._loaded)
                 self.th.start()
 
     # --- Toggle Loop/Shuffle/Volume ---
     def _toggle_shuffle(self):
         self.shuffle_state = not self.shuffle_state
         self.btn_shuffle.setStyleSheet("color: #00ffaa;" if self.shuffle_state else "color: #666;")
+        if self.shuffle_state: self._reshuffle()
+
+    def _reshuffle(self):
+        # New permutation starting at the current track, so it isn't repeated before the rest
+        N = len(self.current_playlist)
+        order = self._shuffle_order = random.sample(range(N), N); self._shuffle_pos = 0
+        if 0 <= self.current_index < N:
+            i = order.index(self.current_index); order[0], order[i] = order[i], order[0]
         
     def _toggle_loop(self):
         # 0=Off, 1=All, 2=One
@@ -610,79 +843,109 @@ class AuraApp(QMainWindow):
     # --- Presets & UI Logic ---
     
     def _populate_tree(self):
-        self.tree.blockSignals(True)
+        self.tree.blockSignals(True); self.tree.setUpdatesEnabled(False)
+        # Items are built detached and attached level by level in bulk
+        tops = []
         for cat, sub in FEATURES.items():
-            p = QTreeWidgetItem(self.tree, [cat]); p.setFlags(Qt.ItemFlag.NoItemFlags)
+            p = QTreeWidgetItem([cat]); p.setFlags(Qt.ItemFlag.NoItemFlags)
+            groups = []
             for s, items in sub.items():
-                g = QTreeWidgetItem(p, [s]); g.setFlags(Qt.ItemFlag.NoItemFlags)
+                g = QTreeWidgetItem([s]); g.setFlags(Qt.ItemFlag.NoItemFlags)
+                leaves = []
                 for i in items:
-                    it = QTreeWidgetItem(g, [i]); it.setCheckState(0, Qt.CheckState.Unchecked)
+                    it = QTreeWidgetItem([i]); it.setCheckState(0, Qt.CheckState.Unchecked)
                     it.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-                    self.effect_items[i] = it
-        self.tree.expandToDepth(1); self.tree.blockSignals(False)
+                    self.effect_items[EFFECT(i)] = it; leaves.append(it)
+                g.addChildren(leaves); groups.append(g)
+            p.addChildren(groups); tops.append(p)
+        self.tree.addTopLevelItems(tops)
+        self.tree.expandToDepth(1); self.tree.setUpdatesEnabled(True); self.tree.blockSignals(False)
 
     def _on_preset_changed(self, name):
+        if self._save_timer.isActive(): self._save_timer.stop(); self._save_to_custom()
         if name not in PRESETS: return
         p = PRESETS[name]
         
-        self.dial.blockSignals(True); self.dial.setValue(int(p["i"]*100)); self.dial.blockSignals(False)
-        self.mix.blockSignals(True); self.mix.setValue(int(p["w"]*100)); self.mix.blockSignals(False)
-        self.engine.state.global_intensity = p["i"]
-        self.engine.state.wet_dry = p["w"]
+        self.dial.blockSignals(True); self.dial.setValue(int(p.i*100)); self.dial.blockSignals(False)
+        self.mix.blockSignals(True); self.mix.setValue(int(p.w*100)); self.mix.blockSignals(False)
+        self.engine.state.global_intensity = p.i
+        self.engine.state.wet_dry = p.w
         
+        self._enabled_set = set(p.fx.intersection(self.effect_items))
+        self.engine.state.enabled = dict.fromkeys(self._enabled_set, True)
+        self._crossfade_on = "Crossfade" in self._enabled_set
+        # One pass over the items, the tree repaints on its own once the event loop runs
         self.tree.blockSignals(True)
-        for it in self.effect_items.values(): it.setCheckState(0, Qt.CheckState.Unchecked)
-        self.engine.state.enabled.clear()
-        for fx in p["fx"]:
-            if fx in self.effect_items:
-                self.effect_items[fx].setCheckState(0, Qt.CheckState.Checked)
-                self.engine.set_enabled(fx, True)
-        self.tree.blockSignals(False); self.tree.repaint()
+        for name, it in self.effect_items.items():
+            it.setCheckState(0, Qt.CheckState.Checked if name in self._enabled_set else Qt.CheckState.Unchecked)
+        self.tree.blockSignals(False)
 
     def _toggle_fx(self, item, col):
         if item.childCount() == 0: 
-            self.engine.set_enabled(item.text(0), item.checkState(0) == Qt.CheckState.Checked)
-            self._save_to_custom()
+            name = EFFECT(item.text(0)); on = item.checkState(0) == Qt.CheckState.Checked
+            self.engine.set_enabled(name, on)
+            if on: self._enabled_set.add(name)
+            else: self._enabled_set.discard(name)
+            if name == "Crossfade": self._crossfade_on = on
+            self._save_timer.start()
             self.combo.blockSignals(True); self.combo.setCurrentIndex(0); self.combo.blockSignals(False)
 
     def _set_param(self, k, v): 
         setattr(self.engine.state, k, v)
-        self._save_to_custom()
+        self._save_timer.start()
         self.combo.blockSignals(True); self.combo.setCurrentIndex(0); self.combo.blockSignals(False)
 
     def _save_to_custom(self):
         # Saves current state to "Custom / Modified" slot so switching back restores it
-        current_fx = [k for k, v in self.engine.state.enabled.items() if v]
-        PRESETS["--- Custom / Modified ---"] = {
-            "i": self.engine.state.global_intensity,
-            "w": self.engine.state.wet_dry,
-            "fx": current_fx
-        }
+        PRESETS["--- Custom / Modified ---"] = Preset(self.engine.state.global_intensity, self.engine.state.wet_dry, frozenset(self._enabled_set))
 
     # --- Library ---
     def _scan(self):
         d = QFileDialog.getExistingDirectory(self, "Music Folder"); 
         if not d: return
-        self.sc = LibraryScanner(d); self.th = QThread(); self.sc.moveToThread(self.th)
-        self.th.started.connect(self.sc.run); self.sc.finished.connect(lambda: (self._refresh_lib(), self.th.quit()))
-        self.th.start()
-
-    def _refresh_lib(self, txt=None):
-        if txt is None and isinstance(self.sender(), QLineEdit): txt = self.sender().text()
-        self.lib_tree.clear()
-        for f in self.db.get_folders(txt):
-            fi = QTreeWidgetItem(self.lib_tree, [f]); fi.setFlags(Qt.ItemFlag.ItemIsEnabled)
-            for n, p in self.db.get_tracks_in_folder(f, txt):
-                ti = QTreeWidgetItem(fi, [n]); ti.setData(0, Qt.ItemDataRole.UserRole, p)
-        if txt: self.lib_tree.expandAll()
+        if self.scan_proc is not None: return
+        # Walk in a separate process so the GUI thread never competes for the GIL, rows are drained on a timer
+        self.scan_q = multiprocessing.Queue()
+        self.scan_proc = multiprocessing.Process(target=_scan_worker, args=(d, self.scan_q), daemon=True); self.scan_proc.start()
+        self.scan_timer.start()
+
+    def _drain_scan(self):
+        # Everything that arrived this tick goes into the DB as one transaction
+        pending = []; done = False
+        while True:
+            try: item = self.scan_q.get_nowait()
+            except queue.Empty:
+                done = self.scan_proc.exitcode not in (None, 0) # Worker died before its end marker
+                break
+            if item is None: done = True; break
+            if isinstance(item, tuple): self.prog.setValue(100 * item[0] // item[1])
+            else: pending.extend(item)
+        if pending: self.db.add_tracks(pending)
+        if not done: return
+        self.scan_timer.stop(); self.scan_proc.join(); self.scan_proc = None
+        self._refresh_lib()
+
+    def _run_search(self):
+        txt = self.lib_search.text()
+        if txt == self._last_txt: return
+        self._last_txt = txt
+        self.lib_proxy.setFilterRegularExpression(_compile_filter(txt)); self._expand_lib()
+
+    def _refresh_lib(self):
+        self.lib_model.set_library(self.db.get_library()); self._expand_lib()
+
+    def _expand_lib(self):
+        if self.lib_proxy.filterRegularExpression().pattern(): self.lib_tree.expandAll()
         else: self.lib_tree.expandToDepth(0)
 
-    def _lib_dbl_click(self, item):
-        path = item.data(0, Qt.ItemDataRole.UserRole)
+    def _lib_dbl_click(self, index):
+        path = index.data(Qt.ItemDataRole.UserRole)
         if path:
-            parent = item.parent()
-            self.current_playlist = [parent.child(i).data(0, Qt.ItemDataRole.UserRole) for i in range(parent.childCount())]
-            self.current_index = self.current_playlist.index(path)
+            # Playlist is the visible (filtered) tracks of the clicked folder
+            parent = index.parent()
+            self.current_playlist = [self.lib_proxy.index(i, 0, parent).data(Qt.ItemDataRole.UserRole) for i in range(self.lib_proxy.rowCount(parent))]
+            self.current_index = index.row() # Proxy row is the position among the visible siblings
+            if self.shuffle_state: self._reshuffle()
             self._play_current()
 
     # --- Dual-Deck Playback & Crossfading ---
@@ -691,24 +954,29 @@ class AuraApp(QMainWindow):
         if not (0 <= self.current_index < len(self.current_playlist)): return
         
         target_path = self.current_playlist[self.current_index]
+        self._request_bpm(target_path)
         
         # Check if we should crossfade (Playing AND not already fading)
         if self.current_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState and not self.is_crossfading:
             self.next_out.setVolume(0.0) # Start silent
-            self.next_player.setSource(QUrl.fromLocalFile(target_path))
+            # Fading from here on, so a load failure on the incoming deck goes to _abort_crossfade
+            self.is_crossfading = True; self._incoming_path = target_path
+            url = QUrl.fromLocalFile(target_path)
+            # Usually preloaded already; a broken preload is loaded again so its failure is reported now
+            if (self.next_player.source() != url or self.next_player.error() != QMediaPlayer.Error.NoError
+                    or self.next_player.mediaStatus() == QMediaPlayer.MediaStatus.InvalidMedia):
+                self.next_player.setSource(QUrl()); self.next_player.setSource(url)
+            self._preloaded_idx = -1; self._preload_failed = False
             self.next_player.play()
             
-            self.is_crossfading = True
-            self.xfade_start_time = time.time()
-            self.cross_timer.start()
             self.path_txt.setText(f"Mixing: {os.path.basename(target_path)}")
             return
 
         # Hard start or Reset
-        self.is_crossfading = False; self.cross_timer.stop()
+        self.is_crossfading = False; self._preloaded_idx = -1; self._preload_failed = False
         self.player_a.stop(); self.player_b.stop()
         self.out_a.setVolume(self.master_volume); self.out_b.setVolume(self.master_volume)
-        self.active_player = 0 
+        self.active_player = 0; self._active_path = target_path
         
         self.current_player.setSource(QUrl.fromLocalFile(target_path))
         self.current_player.play()
@@ -719,7 +987,17 @@ class AuraApp(QMainWindow):
         N = len(self.current_playlist)
         
         if self.shuffle_state:
-            return random.randint(0, N - 1)
+            if len(self._shuffle_order) != N: self._reshuffle()
+            order = self._shuffle_order
+            # Re-sync if a track was picked outside the shuffle order
+            if 0 <= self.current_index < N and order[self._shuffle_pos] != self.current_index:
+                self._shuffle_pos = order.index(self.current_index)
+            pos = self._shuffle_pos + (1 if advance else -1)
+            if pos >= N:
+                if self.loop_state != 1: return -1 # Stop
+                pos = 0
+            elif pos < 0: pos = N - 1 if self.loop_state == 1 else 0
+            return order[pos]
         else:
             if not advance: # Previous
                 idx = self.current_index - 1
@@ -738,6 +1016,8 @@ class AuraApp(QMainWindow):
         # Loop One logic
         if self.loop_state == 2:
             next_idx = self.current_index
+        elif self._preloaded_idx != -1:
+            next_idx = self._preloaded_idx # Keep the shuffle pick that was preloaded
         else:
             next_idx = self._get_next_index(advance=True)
             
@@ -747,32 +1027,69 @@ class AuraApp(QMainWindow):
         # _play_current handles the crossfade triggering if we are playing
         self._play_current()
 
-    def _check_xfade_trigger(self):
-        if not self.engine.is_enabled("Crossfade"): return
+    def _check_xfade_trigger(self, pos):
+        if not self._crossfade_on or self.is_crossfading: return
+        dur = self._deck_duration[self.active_player]
+        left = dur - pos
+        if left > 10000 or dur <= 5000: return # Nothing to decide outside the last 10s
         if self.current_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState: return
-        if self.is_crossfading: return
+        if self._xfade_for != self._active_path: self._resolve_xfade()
         
-        dur = self.current_player.duration()
-        pos = self.current_player.position()
-        if dur > 5000 and (dur - pos) < self.xfade_duration:
+        if left < self.xfade_duration:
             self._trigger_crossfade_next()
-
-    def _crossfade_step(self):
-        now = time.time()
-        elapsed = (now - self.xfade_start_time) * 1000 # ms
-        progress = elapsed / self.xfade_duration
-        
-        if progress >= 1.0:
-            self.cross_timer.stop()
-            self.is_crossfading = False
-            self.current_player.stop() # Stop the old track
-            self.active_player = 1 if self.active_player == 0 else 0 # Swap
-            self.current_out.setVolume(self.master_volume)
-            self.next_out.setVolume(self.master_volume) # Reset levels
-        else:
-            # Linear fade with master scaling
-            self.current_out.setVolume((1.0 - progress) * self.master_volume)
-            self.next_out.setVolume(progress * self.master_volume)
+        elif left < self.xfade_duration + 2000 and self._preloaded_idx == -1 and not self._preload_failed:
+            # Open the upcoming file on the idle deck now so the fade doesn't wait on demux/codec setup
+            idx = self.current_index if self.loop_state == 2 else self._get_next_index(advance=True)
+            if idx != -1:
+                self.next_player.setSource(QUrl.fromLocalFile(self.current_playlist[idx])); self._preloaded_idx = idx
+
+    def _request_bpm(self, path):
+        # Collect whatever finished meanwhile, skipped tracks never reach _resolve_xfade
+        for done in [p for p, job in self._bpm_jobs.items() if job.done()]: self._store_bpm(done, self._bpm_jobs.pop(done).result())
+        if path in self.track_bpm or path in self._bpm_jobs: return
+        bpm = self.db.get_bpm(path)
+        if bpm is not None: self.track_bpm[path] = bpm
+        else: self._bpm_jobs[path] = self._bpm_pool.submit(estimate_bpm, path)
+
+    def _store_bpm(self, path, bpm):
+        self.track_bpm[path] = bpm
+        if bpm: self.db.set_bpm(path, bpm)
+
+    def _resolve_xfade(self):
+        # T_cf = max(120 / bpm, 0.3) s for the outgoing track; retried each tick until its estimate is in
+        path = self._active_path
+        if path not in self.track_bpm:
+            job = self._bpm_jobs.get(path)
+            if job is not None and not job.done(): self.xfade_duration = self.xfade_default; return
+            self._store_bpm(path, self._bpm_jobs.pop(path).result() if job is not None else None)
+        bpm = self.track_bpm[path]
+        self.xfade_duration = int(max(120.0 / bpm, 0.3) * 1000) if bpm else self.xfade_default
+        self._xfade_for = path
+
+    def _crossfade_step(self, pos):
+        # Progress follows the incoming deck's playback clock, so stalls and pauses hold the fade
+        progress = pos / self.xfade_duration
+        if progress >= 1.0: self._crossfade_done(); return
+        # Equal-power fade (cos/sin) keeps the summed loudness flat, scaled by master
+        theta = 0.5 * math.pi * progress
+        self.current_out.setVolume(math.cos(theta) * self.master_volume)
+        self.next_out.setVolume(math.sin(theta) * self.master_volume)
+
+    def _crossfade_done(self):
+        if not self.is_crossfading: return
+        self.is_crossfading = False
+        self.current_player.stop() # Stop the old track
+        self.active_player = 1 if self.active_player == 0 else 0 # Swap
+        self._active_path = self._incoming_path
+        self._set_total(self._deck_duration[self.active_player])
+        self.current_out.setVolume(self.master_volume)
+        self.next_out.setVolume(self.master_volume) # Reset levels
+
+    def _abort_crossfade(self):
+        # Incoming deck can't play, so it will never drive the fade: keep the outgoing track, or move past it if it already ended
+        self.is_crossfading = False; self.next_player.stop()
+        self.current_out.setVolume(self.master_volume); self.next_out.setVolume(self.master_volume)
+        if self.current_player.mediaStatus() == QMediaPlayer.MediaStatus.EndOfMedia: self._play_next()
 
     def _play_next(self): 
         idx = self._get_next_index(advance=True)
@@ -792,13 +1109,21 @@ class AuraApp(QMainWindow):
         if self.current_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState: 
             self.current_player.pause(); self.next_player.pause()
         elif self.current_player.source().isEmpty(): QMessageBox.info(self, "Empty", "Select track from Library.")
-        else: self.current_player.play()
+        else:
+            self.current_player.play()
+            if self.is_crossfading: self.next_player.play() # Both decks were paused, the fade resumes with them
         
     def _stop_playback(self): 
         self.player_a.stop(); self.player_b.stop()
         self.orb.set_playing(False)
         
     def _on_media_status_changed(self, s): 
+        # Incoming track shorter than the fade: complete the swap so it advances normally
+        if s == QMediaPlayer.MediaStatus.EndOfMedia and self.is_crossfading and self.sender() is self.next_player:
+            self._crossfade_done()
+        if s == QMediaPlayer.MediaStatus.InvalidMedia and self.sender() is self.next_player:
+            if self.is_crossfading: self._abort_crossfade()
+            else: self._drop_preload()
         # If media ends naturally and we aren't crossfading
         if s == QMediaPlayer.MediaStatus.EndOfMedia and not self.is_crossfading:
              if self.loop_state == 2: # Loop One - Replay
@@ -806,6 +1131,17 @@ class AuraApp(QMainWindow):
              else:
                  self._play_next()
              
+    def _on_player_error(self, err, msg):
+        if self.sender() is not self.next_player: return
+        if self.is_crossfading: self._abort_crossfade()
+        else: self._drop_preload()
+
+    def _drop_preload(self):
+        # The idle deck couldn't open the upcoming file: forget it so the fade starts with a fresh load
+        if self._preloaded_idx == -1: return
+        self._preloaded_idx = -1; self._preload_failed = True
+        self.next_player.setSource(QUrl())
+
     def _on_playback_state_changed(self, s):
         pl = (s == QMediaPlayer.PlaybackState.PlayingState)
         self.orb.set_playing(pl); self.btn_play.setText("⏸" if pl else "▶")
@@ -813,38 +1149,54 @@ class AuraApp(QMainWindow):
     # --- Seek & UI Updates ---
     def _seek_press(self): self.is_slider_dragging = True
     def _seek_release(self): self.current_player.setPosition(self.seek.value()); self.is_slider_dragging = False
-    def _seek_move(self, v): self._upd_time(v, self.current_player.duration())
+    def _seek_move(self, v): self._upd_time(v)
     
+    def _pos_a(self, p): self._on_position_changed(p, 0)
+    def _pos_b(self, p): self._on_position_changed(p, 1)
+    def _dur_a(self, d): self._on_duration_changed(d, 0)
+    def _dur_b(self, d): self._on_duration_changed(d, 1)
+
     def _on_position_changed(self, p, player_id): 
-        # Only update UI for active player
-        if player_id != self.active_player: return
+        # The incoming deck only drives the fade, UI follows the active player
+        if player_id != self.active_player:
+            if self.is_crossfading: self._crossfade_step(p)
+            return
         if not self.is_slider_dragging: self.seek.setValue(p)
-        self._upd_time(p, self.current_player.duration())
+        self._upd_time(p)
+        self._check_xfade_trigger(p)
         
     def _on_duration_changed(self, d, player_id): 
-        if player_id != self.active_player: return
-        self.seek.setRange(0, d)
+        self._deck_duration[player_id] = d
+        if player_id == self.active_player: self._set_total(d)
+
+    def _set_total(self, t): self.seek.setRange(0, t); self._total_str = f"{t//60000}:{(t//1000)%60:02}"
         
-    def _upd_time(self, c, t): self.time_lbl.setText(f"{c//60000}:{(c//1000)%60:02} / {t//60000}:{(t//1000)%60:02}")
+    def _upd_time(self, c):
+        txt = f"{c//60000}:{(c//1000)%60:02} / {self._total_str}"
+        if txt != self._time_txt: self._time_txt = txt; self.time_lbl.setText(txt)
 
     # --- Processing ---
     def _load_process(self):
         p, _ = QFileDialog.getOpenFileName(self, "Open WAV", "", "WAV (*.wav)"); 
         if not p: return
-        self.ld = AudioLoader(); self.th = QThread(); self.ld.moveToThread(self.th)
-        self.th.started.connect(lambda: self.ld.load(p)); self.ld.finished.connect(self._loaded)
+        self.ld = AudioLoader(p); self.th = QThread(); self.ld.moveToThread(self.th)
+        self.th.started.connect(self.ld.run); self.ld.finished.connect(self._loaded)
         self.th.start()
 
     def _loaded(self, d, sr, p):
-        self.audio_data = d; self.sample_rate = sr; self.orb.ram_load = d.nbytes/(1024*1024); self.th.quit()
+        self.audio_data = d; self.audio_path = p; self.sample_rate = sr; self.orb.ram_load = 0.0; self.th.quit() # Mapped, pages load on demand
         self.prog.setValue(100)
 
     def _export(self):
         if self.audio_data is None: return
         p, _ = QFileDialog.getSaveFileName(self, "Save", "", "WAV (*.wav)"); 
         if not p: return
-        self.pr = AudioProcessor(self.engine, self.audio_data, self.sample_rate); self.th = QThread(); self.pr.moveToThread(self.th)
-        self.th.started.connect(self.pr.run); self.pr.finished.connect(lambda r: (write_wav(p, r, self.sample_rate), self.th.quit(), QMessageBox.information(self, "Done", "Saved!")))
+        # The loaded file stays memory-mapped while the render reads from it
+        if os.path.exists(p) and os.path.samefile(p, self.audio_path):
+            QMessageBox.warning(self, "Export", "Cannot overwrite the file being processed, choose another name."); return
+        self.pr = AudioProcessor(self.engine, self.audio_data, p); self.th = QThread(); self.pr.moveToThread(self.th)
+        self.th.started.connect(self.pr.run); self.pr.finished.connect(lambda _p: (self.th.quit(), QMessageBox.information(self, "Done", "Saved!")))
+        self.pr.error.connect(lambda e: (self.th.quit(), QMessageBox.critical(self, "Export failed", e)))
         self.th.start()
 
 def main():